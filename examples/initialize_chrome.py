@@ -1,32 +1,57 @@
-# from chromedriver_py import binary_path
+import os
+from contextlib import ExitStack
 
-
-from src.application.profile_service import ProfileService
-from src.infra.browser_config_builder import BrowserConfigBuilder
-from src.infra.selenium_session import SeleniumSession
 from src.utils.logger import logger
 
 
-
-chrome_connections = {
-    'browser_type': 'chrome',
-    #  'binary_path': binary_path
-    'binary_path': '/path/to/chromedriver'
-}
-
-# due the remote driver, is chrome-standalone, the options should be chrome type
-options = BrowserConfigBuilder('chrome').set_no_sandbox().disable_dev_shm_usage().set_browser_profile('./profiles/test_profile').build()
-session = SeleniumSession()
-profile_service = ProfileService()
-
-new_profile = profile_service.new_profile(
-    driver_name='test_driver',
-    tab_name='initial_tab',
-    session=session,
-    profile_options=options,
-    connection=chrome_connections
-)
-
-url = 'https://demoqa.com'
-new_profile.session.get(url)
-logger.info('Navigated to demoqa.com')
+def get_chromedriver_path() -> str:
+    # imported here so that importing this module does not resolve the bundled binary
+    try:
+        from chromedriver_py import binary_path
+    except ImportError:
+        return '/path/to/chromedriver'
+    return binary_path
+
+
+def run():
+    from src.application.profile_service import ProfileService
+    from src.infra.browser_config_builder import BrowserConfigBuilder
+    from src.infra.selenium_session import SeleniumSession
+
+    chrome_connections = {
+        'browser_type': 'chrome',
+        'binary_path': get_chromedriver_path()
+    }
+
+    # due the remote driver, is chrome-standalone, the options should be chrome type
+    # session and profile service are created per call, so several runs can go in parallel
+    builder = BrowserConfigBuilder('chrome').set_no_sandbox().disable_dev_shm_usage().set_page_load_strategy('eager').enable_disk_cache('./profiles/cache').set_browser_profile('./profiles/test_profile').disable_gpu().disable_extensions().disable_images()
+    # headless unless HEADED=1 is set for local debugging
+    if not os.environ.get('HEADED'):
+        builder.set_headless()
+    options = builder.build()
+    with ExitStack() as stack:
+        session = SeleniumSession()
+        # the driver is quit even if a later step raises
+        stack.callback(session.close)
+        profile_service = ProfileService()
+
+        new_profile = profile_service.new_profile(
+            driver_name='test_driver',
+            tab_name='initial_tab',
+            session=session,
+            profile_options=options,
+            connection=chrome_connections
+        )
+
+        url = 'https://demoqa.com'
+        new_profile.session.get(url)
+        logger.info('Navigated to demoqa.com')
+
+        # keep the browser open for a manual look only when asked; automated runs close right away
+        if os.environ.get('INSPECT_BROWSER'):
+            input('Press Enter to close browser...')
+
+
+if __name__ == '__main__':
+    run()
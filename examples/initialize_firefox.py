@@ -1,31 +1,49 @@
-from src.core.ports import Locator
-from src.application.profile_service import ProfileService
-from src.infra.browser_config_builder import BrowserConfigBuilder
-from src.infra.selenium_session import SeleniumSession
+import os
+from contextlib import ExitStack
+
 from src.utils.logger import logger
 
-from selenium.webdriver.common.keys import Keys
 
+def run():
+    from src.application.profile_service import ProfileService
+    from src.infra.browser_config_builder import BrowserConfigBuilder
+    from src.infra.selenium_session import SeleniumSession
+
+    # session and profile service are created per call, so several runs can go in parallel
+    builder = BrowserConfigBuilder('firefox').set_page_load_strategy('eager').set_browser_profile('/home/kasrastar/Desktop/random').disable_images()
+    # headless unless HEADED=1 is set for local debugging
+    if not os.environ.get('HEADED'):
+        builder.set_headless()
+    options = builder.build()
+    with ExitStack() as stack:
+        session = SeleniumSession()
+        # the driver is quit even if a later step raises
+        stack.callback(session.close)
+        profile_service = ProfileService()
+
+        new_profile = profile_service.new_profile(
+            driver_name='test_driver',
+            tab_name='initial_tab',
+            session=session,
+            profile_options=options,
+            connection={
+                'browser_type': 'firefox',
+                'binary_path':  '/usr/bin/geckodriver'
+            }
+        )
+
+        # localhost:53399 remote driver
 
-options = BrowserConfigBuilder('firefox').set_browser_profile('/home/kasrastar/Desktop/random').build()
-session = SeleniumSession()
-profile_service = ProfileService()
+        logger.info('Profile created successfully')
 
-new_profile = profile_service.new_profile(
-    driver_name='test_driver',
-    tab_name='initial_tab',
-    session=session,
-    profile_options=options,
-    connection={
-        'browser_type': 'firefox',
-        'binary_path':  '/usr/bin/geckodriver'
-    }
-)
+        url = 'https://www.google.com'
+        new_profile.session.get(url)
+        logger.info('Navigated to %s', url)
 
-# localhost:53399 remote driver
+        # keep the browser open for a manual look only when asked; automated runs close right away
+        if os.environ.get('INSPECT_BROWSER'):
+            input('Press Enter to close browser...')
 
-logger.info('Profile created successfully')
 
-url = 'https://www.google.com'
-new_profile.session.get(url)
-logger.info(f'Navigated to {url}')
+if __name__ == '__main__':
+    run()
@@ -1,8 +1,7 @@
-from src.application.profile_service import ProfileService
-from src.infra.browser_config_builder import BrowserConfigBuilder
-from src.infra.selenium_session import SeleniumSession
-from src.utils.logger import logger
+import os
+from contextlib import ExitStack
 
+from src.utils.logger import logger
 
 
 remote_connections = {
@@ -10,19 +9,41 @@ remote_connections = {
     'remote_url': 'http://localhost:7997/wd/hub',
 }
 
-# due the remote driver, is chrome-standalone, the options should be chrome type
-options = BrowserConfigBuilder('chrome').set_browser_profile('/home/kasrastar/Desktop/random').build()
-session = SeleniumSession()
-profile_service = ProfileService()
-
-new_profile = profile_service.new_profile(
-    driver_name='test_driver',
-    tab_name='initial_tab',
-    session=session,
-    profile_options=options,
-    connection=remote_connections
-)
-
-url = 'https://demoqa.com'
-new_profile.session.get(url)
-logger.info('Navigated to demoqa.com')
+
+def run():
+    from src.application.profile_service import ProfileService
+    from src.infra.browser_config_builder import BrowserConfigBuilder
+    from src.infra.selenium_session import SeleniumSession
+
+    # due the remote driver, is chrome-standalone, the options should be chrome type
+    # session and profile service are created per call, so several runs can go in parallel
+    builder = BrowserConfigBuilder('chrome').set_page_load_strategy('eager').set_browser_profile('/home/kasrastar/Desktop/random').disable_gpu().disable_extensions().disable_images()
+    # headless unless HEADED=1 is set for local debugging
+    if not os.environ.get('HEADED'):
+        builder.set_headless()
+    options = builder.build()
+    with ExitStack() as stack:
+        session = SeleniumSession()
+        # the driver is quit even if a later step raises
+        stack.callback(session.close)
+        profile_service = ProfileService()
+
+        new_profile = profile_service.new_profile(
+            driver_name='test_driver',
+            tab_name='initial_tab',
+            session=session,
+            profile_options=options,
+            connection=remote_connections
+        )
+
+        url = 'https://demoqa.com'
+        new_profile.session.get(url)
+        logger.info('Navigated to demoqa.com')
+
+        # keep the browser open for a manual look only when asked; automated runs close right away
+        if os.environ.get('INSPECT_BROWSER'):
+            input('Press Enter to close browser...')
+
+
+if __name__ == '__main__':
+    run()
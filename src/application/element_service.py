@@ -1,19 +1,36 @@
-from typing import Optional, List, Any
+from collections import OrderedDict
+from typing import Optional, List, Any, Callable, Dict, Iterator
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.common.by import By
 
 from ..core.ports import BrowserSessionPort, Locator, WaitCondition
 
 class ElementService:
-    def __init__(self, session: BrowserSessionPort):
+    ELEMENT_CACHE_SIZE = 32
+    CACHED_CONDITIONS = frozenset({WaitCondition.VISIBILITY_OF_ELEMENT_LOCATED, WaitCondition.ELEMENT_TO_BE_CLICKABLE})
+
+    def __init__(self, session: BrowserSessionPort, poll_frequency: Optional[float] = None):
         self.session = session
+        # explicit-wait poll interval for this service's lookups; None uses the session's (50ms local, 250ms remote).
+        # shorter finds elements sooner after they appear, at the cost of more commands sent while waiting
+        self.poll_frequency = poll_frequency
+        # recently located visible/clickable elements; a hit is re-checked in one script call (attached, still
+        # matched, visible, enabled) instead of the find + is_displayed + is_enabled a fresh wait takes
+        self._element_cache: OrderedDict = OrderedDict()
     
-    def click(self, locator: Locator, root_handle: Optional[str] = None, root_element: Optional[Any] = None):
+    def click(self, locator: Locator, root_handle: Optional[str] = None, root_element: Optional[Any] = None, scroll_into_view: bool = False):
         el = self._locate(locator, WaitCondition.ELEMENT_TO_BE_CLICKABLE, root_handle, root_element)
         if el:
+            if scroll_into_view:
+                self.session.scroll_into_view(el)
             el.click()
 
-    def send_keys(self, locator: Locator, text: str, root_handle: Optional[str] = None, root_element: Optional[Any] = None):
+    def send_keys(self, locator: Locator, text: str, root_handle: Optional[str] = None, root_element: Optional[Any] = None, scroll_into_view: bool = False):
         el = self._locate(locator, WaitCondition.PRESENCE_OF_ELEMENT_LOCATED, root_handle, root_element)
         if el:
+            if scroll_into_view:
+                self.session.scroll_into_view(el)
             el.send_keys(text)
 
     def clear(self, locator: Locator, root_handle: Optional[str] = None, root_element: Optional[Any] = None):
@@ -21,10 +38,124 @@ class ElementService:
         if el:
             el.clear()
 
-    def find_all(self, locator: Locator, timeout: int = 15, scroll_into_view: bool = False, root_element: Optional[Any] = None) -> List[Any]:
-        return self.session.find_elements(locator, timeout=timeout, scroll_into_view=scroll_into_view, root_element=root_element)
+    def set_value(self, locator: Locator, text: str, root_handle: Optional[str] = None, root_element: Optional[Any] = None, use_script: bool = False):
+        # clear + type against a single locate; use_script does it in one round-trip but skips real key events
+        el = self._locate(locator, WaitCondition.PRESENCE_OF_ELEMENT_LOCATED, root_handle, root_element)
+        if not el:
+            return
+        if use_script:
+            self.session.set_element_value(el, text)
+        else:
+            el.clear()
+            el.send_keys(text)
+
+    def perform(
+        self,
+        locator: Locator,
+        actions: List[Callable[[Any], Any]],
+        condition: str = WaitCondition.PRESENCE_OF_ELEMENT_LOCATED,
+        root_handle: Optional[str] = None,
+        root_element: Optional[Any] = None
+    ) -> bool:
+        # e.g. perform(loc, [lambda el: el.click(), lambda el: el.send_keys('x')]): one locate (and one cache probe) for the chain
+        el = self._locate(locator, condition, root_handle, root_element)
+        if not el:
+            return False
+        for action in actions:
+            try:
+                action(el)
+            except StaleElementReferenceException:
+                # an earlier action re-rendered the element; locate it once more and carry on
+                self.invalidate()
+                el = self._locate(locator, condition, root_handle, root_element)
+                if not el:
+                    return False
+                action(el)
+        return True
+
+    def fill_form(self, fields: Dict[Locator, str], root_element: Optional[Any] = None) -> List[Locator]:
+        # one execute_script for the whole form instead of a locate + clear + send_keys per field
+        return self.session.fill_fields(fields, root_element=root_element)
+
+    def find_child(self, parent: Locator, child: Locator, condition: str = WaitCondition.PRESENCE_OF_ELEMENT_LOCATED, root_handle: Optional[str] = None) -> Optional[Any]:
+        joined = parent.join(child)
+        if joined is not None:
+            return self._locate(joined, condition, root_handle)
+        # strategies don't compose: locate the parent, then search under it
+        parent_el = self._locate(parent, WaitCondition.PRESENCE_OF_ELEMENT_LOCATED, root_handle)
+        if not parent_el:
+            return None
+        return self._locate(child, condition, root_handle, parent_el)
+
+    def find_by_id(self, id_: str, root_handle: Optional[str] = None, root_element: Optional[Any] = None) -> Optional[Any]:
+        # id lookups are resolved natively by the browser (getElementById); prefer them over xpath where the page allows
+        return self._locate(Locator(By.ID, id_), WaitCondition.PRESENCE_OF_ELEMENT_LOCATED, root_handle, root_element)
+
+    def verify_present(self, locators: Dict[str, Locator]) -> Dict[str, bool]:
+        # a single query for all checks, rather than one find_element round-trip per locator
+        return self.session.elements_present(locators)
+
+    def wait_until_present(self, locator: Locator, timeout: int = 10) -> bool:
+        return self.session.wait_for_presence(locator, present=True, timeout=timeout)
+
+    def wait_until_absent(self, locator: Locator, timeout: int = 10) -> bool:
+        return self.session.wait_for_presence(locator, present=False, timeout=timeout)
+
+    def find_all(self, locator: Locator, timeout: int = 15, scroll_into_view: bool = False, root_element: Optional[Any] = None, poll_frequency: Optional[float] = None) -> List[Any]:
+        return self.session.find_elements(
+            locator,
+            timeout=timeout,
+            scroll_into_view=scroll_into_view,
+            root_element=root_element,
+            poll_frequency=poll_frequency or self.poll_frequency
+        )
+
+    def find_all_attributes(self, locator: Locator, attributes: List[str], root_element: Optional[Any] = None) -> List[Dict[str, Any]]:
+        # one round-trip for the whole attribute matrix instead of a get_attribute call per element and attribute
+        return self.session.find_elements_attributes(locator, attributes, root_element=root_element)
+
+    def find_all_scalars(self, locator: Locator, fields: List[str], root_element: Optional[Any] = None) -> List[List[Any]]:
+        # read-only scraping: plain values back, no element references to serialize
+        return self.session.find_elements_scalars(locator, fields, root_element=root_element)
+
+    def iter_all(self, locator: Locator, attributes: List[str], chunk: int = 50, root_element: Optional[Any] = None) -> Iterator[Dict[str, Any]]:
+        # pages through the matches so a caller that stops early only pays for the chunks it consumed
+        if chunk < 1:
+            raise ValueError(f"chunk must be at least 1, got {chunk}")
+        offset = 0
+        while True:
+            rows = self.session.find_elements_attributes(locator, attributes, root_element=root_element, offset=offset, limit=chunk)
+            yield from rows
+            if len(rows) < chunk:
+                return
+            offset += chunk
 
     def _locate(self, locator: Locator, condition: str, root_handle: Optional[str] = None, root_element: Optional[Any] = None) -> Optional[Any]:
         if root_handle:
             self.session.switch_tab(root_handle)
-        return self.session.find_element(locator, condition=condition, root_element=root_element)
+        # presence needs a round-trip to verify either way, as many as finding it again, so it isn't cached
+        cacheable = condition in self.CACHED_CONDITIONS
+        key = (locator.by, locator.value, condition, getattr(root_element, 'id', None), root_handle)
+        el = self._element_cache.get(key) if cacheable else None
+        if el is not None:
+            try:
+                # a hit still has to satisfy the locator and condition now; if it doesn't, wait for it like a miss
+                if self.session.still_matches(el, locator, root_element, enabled=condition == WaitCondition.ELEMENT_TO_BE_CLICKABLE):
+                    self._element_cache.move_to_end(key)
+                    return el
+            except StaleElementReferenceException:
+                pass
+            del self._element_cache[key]
+        if condition == WaitCondition.PRESENCE_OF_ELEMENT_LOCATED and self.session.implicit_wait:
+            # existence only: let the driver wait instead of polling it over the wire
+            el = self.session.find_element_implicit(locator, root_element=root_element)
+        else:
+            el = self.session.find_element(locator, condition=condition, root_element=root_element, poll_frequency=self.poll_frequency)
+        if el is not None and cacheable:
+            self._element_cache[key] = el
+            if len(self._element_cache) > self.ELEMENT_CACHE_SIZE:
+                self._element_cache.popitem(last=False)
+        return el
+
+    def invalidate(self):
+        self._element_cache.clear()
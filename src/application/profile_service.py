@@ -1,17 +1,48 @@
 # --- application/profile_manager.py ---
-from typing import Dict, List, Optional
+import copy
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 
-from ..infra.browser_config_builder import BrowserConfigBuilder
+from selenium.common.exceptions import WebDriverException
+
+from ..infra.browser_config_builder import BrowserConfigBuilder, persistent_profile_dir
 from ..infra.selenium_session import SeleniumSession
 from ..domain.driver import DefaultDriverStatus
 from ..domain.tab import Tab, DefaultTabStatus
 from .tab_service import TabService
 from .element_service import ElementService
+from ..utils.exceptions import BrowserInitializationError
 from ..utils.logger import logger
 
+LOCK_STRIPES = 16
+DEFAULT_RETRY_BACKOFF = (0.5, 1.0, 2.0)
+
+
+def _is_transient(error: Exception) -> bool:
+    # DriverCreator wraps every failure in BrowserInitializationError; what it wrapped tells a grid hiccup
+    # (webdriver or connection error) from something retrying can't fix (missing binary, bad config)
+    if isinstance(error, (WebDriverException, ConnectionError)):
+        return True
+    wrapped = error.__cause__ or error.__context__
+    return wrapped is not None and _is_transient(wrapped)
+
 
 class Profile:
-    def __init__(self, driver_name: str, tab_name: str, session: SeleniumSession, profile_options: BrowserConfigBuilder, connection: dict):
+    __slots__ = ('driver_name', 'session', 'driver_status', 'tab_service', 'element_service')
+
+    def __init__(
+        self,
+        driver_name: str,
+        tab_name: str,
+        session: SeleniumSession,
+        profile_options: BrowserConfigBuilder,
+        connection: dict,
+        reuse_session: bool = False
+    ):
         self.driver_name = driver_name
         self.session = session
         self.driver_status = DefaultDriverStatus.OPEN
@@ -19,6 +50,11 @@ class Profile:
         self.tab_service = TabService(session)
         self.element_service = ElementService(session)
 
+        if reuse_session:
+            logger.info('attach profile to an already running driver.')
+            self.tab_service.attach(tab_name)
+            return
+
         logger.info('requet to initiate new driver.')
 
         self.tab_service.start(
@@ -30,12 +66,78 @@ class Profile:
 
     def close(self):
         self.session.close()
+        self.element_service.invalidate()
+        self.driver_status = DefaultDriverStatus.CLOSED
+
+    def __enter__(self) -> 'Profile':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def release(self):
+        # like close, but the driver keeps running (one blank tab, no cookies or storage, default timeouts) for the next profile
+        self.tab_service.detach()
+        self.session.reset()
+        self.element_service.invalidate()
         self.driver_status = DefaultDriverStatus.CLOSED
 
  
 class ProfileService:
-    def __init__(self):
+    def __init__(self, max_idle_sessions: int = 0, shared_cache_root: Optional[str] = None):
         self.profiles: Dict[str, Profile] = {}
+        # when set, each driver name gets a persistent browser profile dir under it, so later runs start warm
+        self.shared_cache_root = shared_cache_root
+        # warm drivers left by removed profiles, keyed by what they were started with; 0 disables pooling
+        self.max_idle_sessions = max_idle_sessions
+        self._idle: Dict[tuple, List[SeleniumSession]] = {}
+        self._idle_lock = threading.Lock()
+        self._pool_keys: Dict[str, tuple] = {}
+        # pool slots claimed by drivers still being reset, so concurrent parks can't overshoot the cap
+        self._parking: Dict[tuple, int] = {}
+        # striped per-name locks: same-name calls serialize, different names run in parallel
+        self._stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+    def _lock_for(self, driver_name: str) -> threading.Lock:
+        return self._stripes[hash(driver_name) % LOCK_STRIPES]
+
+    @staticmethod
+    def _pool_key(profile_options, connection: dict) -> tuple:
+        # everything the driver was started with (arguments, prefs, experimental options, capabilities),
+        # as canonical json so equal option sets map to the same key
+        to_capabilities = getattr(profile_options, 'to_capabilities', None)
+        capabilities = to_capabilities() if to_capabilities else {}
+        return (
+            connection.get('browser_type', 'chrome').lower(),
+            connection.get('binary_path') or connection.get('remote_url'),
+            json.dumps(capabilities, sort_keys=True, default=str),
+        )
+
+    def _with_cache_dir(self, driver_name: str, profile_options):
+        arguments = getattr(profile_options, 'arguments', None)
+        if not self.shared_cache_root or arguments is None:
+            return profile_options
+        if any(arg.startswith('--user-data-dir') or arg == '-profile' for arg in arguments):
+            # the caller picked a profile dir already
+            return profile_options
+        browser = getattr(profile_options, 'capabilities', {}).get('browserName')
+        if browser not in ('chrome', 'MicrosoftEdge', 'firefox'):
+            return profile_options
+        path = persistent_profile_dir(self.shared_cache_root, driver_name)
+        os.makedirs(path, exist_ok=True)
+        # a copy, the caller may pass the same options object to several profiles
+        profile_options = copy.deepcopy(profile_options)
+        if browser == 'firefox':
+            profile_options.add_argument('-profile')
+            profile_options.add_argument(path)
+        else:
+            profile_options.add_argument(f'--user-data-dir={path}')
+        return profile_options
+
+    def _checkout(self, key: tuple) -> Optional[SeleniumSession]:
+        with self._idle_lock:
+            idle = self._idle.get(key)
+            return idle.pop() if idle else None
 
     def new_profile(
         self,
@@ -45,19 +147,112 @@ class ProfileService:
         profile_options: BrowserConfigBuilder,
         connection: dict 
     ) -> Profile:
-        if driver_name in self.profiles:
-            logger.info('retriving existing profile.')
-            return self.profiles[driver_name]
-        logger.info('initiate new profile.')
-        profile = Profile(driver_name, tab_name, session, profile_options, connection)
-        self.profiles[driver_name] = profile
-        return profile
+        # the lookup and the (slow) driver start must not interleave for the same name
+        with self._lock_for(driver_name):
+            existing = self.profiles.get(driver_name)
+            if existing is not None:
+                logger.info('retriving existing profile.')
+                return existing
+            profile_options = self._with_cache_dir(driver_name, profile_options)
+            key = self._pool_key(profile_options, connection)
+            pooled = self._checkout(key) if session.driver is None else None
+            if pooled is not None:
+                logger.info('initiate new profile on an idle driver.')
+                # the caller's session takes the driver over, so closing it closes the pooled browser too
+                session.adopt(pooled)
+                try:
+                    profile = Profile(driver_name, tab_name, session, profile_options, connection, reuse_session=True)
+                except Exception:
+                    # checked out means nobody else holds it; don't leak a running browser
+                    session.close()
+                    raise
+            else:
+                logger.info('initiate new profile.')
+                profile = Profile(driver_name, tab_name, session, profile_options, connection)
+            self.profiles[driver_name] = profile
+            self._pool_keys[driver_name] = key
+            return profile
+
+    def new_profile_resilient(
+        self,
+        driver_name: str,
+        tab_name: str,
+        session: SeleniumSession,
+        profile_options: BrowserConfigBuilder,
+        connection: dict,
+        attempts: int = 3,
+        backoff: Tuple[float, ...] = DEFAULT_RETRY_BACKOFF
+    ) -> Profile:
+        # grids under parallel load fail session creation transiently, so retry instead of aborting the run
+        if attempts < 1:
+            raise ValueError(f"attempts must be at least 1, got {attempts}")
+        backoff = backoff or DEFAULT_RETRY_BACKOFF
+        for attempt in range(1, attempts + 1):
+            try:
+                return self.new_profile(driver_name, tab_name, session, profile_options, connection)
+            except (BrowserInitializationError, WebDriverException) as e:
+                session.close()
+                if not _is_transient(e):
+                    raise
+                if attempt == attempts:
+                    logger.warning('driver %s failed to start after %s attempts; consider lowering parallelism.', driver_name, attempts)
+                    raise
+                delay = backoff[min(attempt, len(backoff)) - 1]
+                logger.warning('driver %s failed to start (attempt %s/%s), retrying in %ss.', driver_name, attempt, attempts, delay)
+                time.sleep(delay)
+
+    def new_profiles_bulk(
+        self,
+        specs: List[Tuple[str, str, SeleniumSession, BrowserConfigBuilder, dict]],
+        max_workers: int = 8
+    ) -> Dict[str, Profile]:
+        # driver start-up is mostly waiting on the driver process/grid, so threads overlap well
+        if not specs:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(specs))) as executor:
+            futures = {spec[0]: executor.submit(self.new_profile, *spec) for spec in specs}
+        # every start has finished here; the ones that succeeded stay registered even if another failed
+        return {driver_name: future.result() for driver_name, future in futures.items()}
 
     def remove_profile(self, driver_name: str):
-        profile = self.profiles.get(driver_name)
-        if profile:
-            profile.close()
-            del self.profiles[driver_name]
+        with self._lock_for(driver_name):
+            profile = self.profiles.pop(driver_name, None)
+            if profile:
+                key = self._pool_keys.pop(driver_name, None)
+                if not self._park(profile, key):
+                    profile.close()
+
+    def _park(self, profile: Profile, key: Optional[tuple]) -> bool:
+        if key is None or self.max_idle_sessions <= 0:
+            return False
+        with self._idle_lock:
+            if len(self._idle.get(key, [])) + self._parking.get(key, 0) >= self.max_idle_sessions:
+                return False
+            self._parking[key] = self._parking.get(key, 0) + 1
+        # the reset talks to the browser, so it runs outside the lock on the slot claimed above
+        released = False
+        try:
+            profile.release()
+            released = True
+        except Exception:
+            # a driver process that's already gone fails with connection errors rather than WebDriverException
+            logger.warning('could not reset driver of profile %s, closing it instead.', profile.driver_name, exc_info=True)
+        finally:
+            with self._idle_lock:
+                self._parking[key] -= 1
+                if released:
+                    # moved into a session the pool owns, so the caller closing theirs doesn't quit the parked driver
+                    parked = SeleniumSession()
+                    parked.adopt(profile.session)
+                    self._idle.setdefault(key, []).append(parked)
+        return released
+
+    def close_idle_sessions(self):
+        with self._idle_lock:
+            sessions = [session for idle in self._idle.values() for session in idle]
+            self._idle.clear()
+        for session in sessions:
+            session.close()
 
     def get_profile(self, driver_name: str) -> Optional[Profile]:
         return self.profiles.get(driver_name)
\ No newline at end of file
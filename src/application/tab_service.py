@@ -1,64 +1,122 @@
-from typing import Optional, Any
+from functools import wraps
+from typing import Any, Dict, Iterable, List, Optional
 
 from ..core.ports import BrowserSessionPort
+from ..infra.cached_cdp import CachedCdp
 from ..domain.tab import Tab, DefaultTabStatus
 from ..domain.driver import DefaultDriverStatus
 
+_CLOSED = DefaultDriverStatus.CLOSED
+
+
+def _require_open(closed_result: Any = None):
+    # methods that need a live driver return closed_result instead of running once it's closed
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.driver_status is _CLOSED:
+                return closed_result
+            return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
 class TabService:
     def __init__(self, session: BrowserSessionPort):
         self.session = session
-        self.tabs: list[Tab] = []
+        # tabs indexed by name (insertion ordered); only the active tab is tracked, so a switch flips two statuses
+        self._by_name: Dict[str, Tab] = {}
+        self._active: Optional[Tab] = None
         self.driver_status = DefaultDriverStatus.OPEN
+        self.cdp = CachedCdp(session)
+
+    @property
+    def tabs(self) -> List[Tab]:
+        return list(self._by_name.values())
 
     def start(self, browser_type: str, options: Any, connection: dict, first_tab_name: str):
         self.session.open(browser_type, options, connection)
+        self.attach(first_tab_name)
+
+    def attach(self, first_tab_name: str):
+        # adopt the window the (already open) session is focused on as this service's first tab
         # handle = self.session.new_tab()
         handle = self.session.driver.current_window_handle  # type: ignore
-        tab = Tab(name=first_tab_name, window_handle=handle, status=DefaultTabStatus.ACTIVE)
-        self.tabs.append(tab)
+        self._add(Tab(name=first_tab_name, window_handle=handle, status=DefaultTabStatus.ACTIVE))
+        self.driver_status = DefaultDriverStatus.OPEN
 
+    def detach(self):
+        # leave the driver running with a single tab, so it can be reused by another profile
+        tabs = self.tabs
+        for tab in tabs[1:]:
+            self.session.close_tab(tab.window_handle)
+        if tabs:
+            self.session.switch_tab(tabs[0].window_handle)
+        self._by_name.clear()
+        self._active = None
+        self.cdp.invalidate()
+        self.driver_status = DefaultDriverStatus.CLOSED
+
+    @_require_open(closed_result=False)
     def new_tab(self, name: str) -> bool:
-        if self.driver_status == DefaultDriverStatus.CLOSED:
-            return False
         handle = self.session.new_tab()
-        for t in self.tabs:
-            t.update_status(DefaultTabStatus.INACTIVE)
-        tab = Tab(name=name, window_handle=handle, status=DefaultTabStatus.ACTIVE)
-        self.tabs.append(tab)
+        self._add(Tab(name=name, window_handle=handle, status=DefaultTabStatus.ACTIVE))
         return True
 
     def switch_to(self, name: str) -> None:
         tab = self._find(name)
         if not tab:
             return
+        # always switch by window handle; webdriver has no lookup by tab name
         self.session.switch_tab(tab.window_handle)
-        for t in self.tabs:
-            t.update_status(DefaultTabStatus.ACTIVE if t.name == name else DefaultTabStatus.INACTIVE)
+        self._activate(tab)
 
     def close_tab(self, name: str) -> None:
         tab = self._find(name)
         if not tab:
             return
-        if len(self.tabs) == 1:
+        if len(self._by_name) == 1:
             self.close_all()
             return
         self.session.close_tab(tab.window_handle)
-        self.tabs.remove(tab)
+        del self._by_name[name]
+        if self._active is tab:
+            self._active = None
         # activate first
-        self.switch_to(self.tabs[0].name)
+        self.switch_to(next(iter(self._by_name)))
 
     def close_all(self):
         self.session.close()
-        self.tabs.clear()
+        self._by_name.clear()
+        self._active = None
+        self.cdp.invalidate()
         self.driver_status = DefaultDriverStatus.CLOSED
 
+    @_require_open()
     def delete_cookies(self, origin: str, storage: str = 'all'):
-        if self.driver_status == DefaultDriverStatus.CLOSED:
-            return
-        self.session.execute_cdp('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': storage})
+        self.cdp.execute('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': storage})
+
+    @_require_open()
+    def delete_cookies_bulk(self, origins: Iterable[str], storage: str = 'all'):
+        # one pipelined devtools exchange where the browser exposes it
+        self.cdp.invalidate()
+        self.session.execute_cdp_batch([
+            ('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': storage}) for origin in origins
+        ])
+
+    def _add(self, tab: Tab):
+        # names are unique keys; reusing one points it at the newer tab
+        self._by_name[tab.name] = tab
+        self._activate(tab)
+
+    def _activate(self, tab: Tab):
+        if self._active is not None and self._active is not tab:
+            self._active.update_status(DefaultTabStatus.INACTIVE)
+        tab.update_status(DefaultTabStatus.ACTIVE)
+        self._active = tab
 
     def _find(self, name: str) -> Optional[Tab]:
-        return next((t for t in self.tabs if t.name == name), None) 
-    
+        return self._by_name.get(name)
+
     def get_active_tab(self) -> Optional[Tab]:
-        return next((tab for tab in self.tabs if tab.status == DefaultTabStatus.ACTIVE), None)
\ No newline at end of file
+        return self._active
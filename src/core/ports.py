@@ -1,29 +1,88 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By 
 
+
+_VALID_STRATEGIES = frozenset({
+    By.ID,
+    By.XPATH,
+    By.LINK_TEXT,
+    By.PARTIAL_LINK_TEXT,
+    By.NAME,
+    By.TAG_NAME,
+    By.CLASS_NAME,
+    By.CSS_SELECTOR,
+})
+
+
 class Locator:
-    VALID_STRATEGIES = {
-        By.ID,
-        By.XPATH,
-        By.LINK_TEXT,
-        By.PARTIAL_LINK_TEXT,
-        By.NAME,
-        By.TAG_NAME,
-        By.CLASS_NAME,
-        By.CSS_SELECTOR,
+    __slots__ = ('by', 'value', '_tuple')
+
+    # short names resolved once, at construction, to selenium's By constants
+    BY_ALIASES = {
+        'css': By.CSS_SELECTOR,
+        'class': By.CLASS_NAME,
+        'tag': By.TAG_NAME,
+        'link': By.LINK_TEXT,
+        'partial_link': By.PARTIAL_LINK_TEXT,
     }
 
+    VALID_STRATEGIES = _VALID_STRATEGIES
+
     def __init__(self, by: str, value: str):
-        if by not in self.VALID_STRATEGIES:
-            raise ValueError(f"Invalid locator strategy: {by}. Must be one of {list(self.VALID_STRATEGIES)}")
-        self.by = by
-        self.value = value
+        by = self.BY_ALIASES.get(by, by)
+        if by not in _VALID_STRATEGIES:
+            raise ValueError(f"Invalid locator strategy: {by}. Must be one of {sorted(_VALID_STRATEGIES)}")
+        # immutable, so instances are safe as dict / lru_cache keys
+        object.__setattr__(self, 'by', by)
+        object.__setattr__(self, 'value', value)
+        # the (by, value) pair selenium takes, built once rather than per call
+        object.__setattr__(self, '_tuple', (by, value))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def get(by: str, value: str) -> 'Locator':
+        # shared instance per (by, value): hot selectors are validated and allocated once
+        return Locator(by, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Locator is immutable")
+
+    def __reduce__(self):
+        # copy/deepcopy/pickle rebuild through __init__, since __setattr__ is blocked
+        return (Locator, (self.by, self.value))
+
+    def __eq__(self, other):
+        if not isinstance(other, Locator):
+            return NotImplemented
+        return self._tuple == other._tuple
+
+    def __hash__(self):
+        return hash(self._tuple)
+
+    def __repr__(self):
+        return f"Locator(by={self.by!r}, value={self.value!r})"
 
     def as_tuple(self):
-        return self.by, self.value
+        return self._tuple
+
+    def join(self, child: 'Locator') -> Optional['Locator']:
+        # one selector for "child under self", so a scoped lookup is a single find instead of two;
+        # None when the pair can't be expressed that way (mixed strategies, selector lists, unions)
+        if self.by == By.CSS_SELECTOR and child.by == By.CSS_SELECTOR:
+            if ',' in self.value or ',' in child.value:
+                return None
+            return Locator(By.CSS_SELECTOR, f'{self.value} {child.value}')
+        if self.by == By.XPATH and child.by == By.XPATH:
+            if '|' in self.value or '|' in child.value:
+                return None
+            # only relative children ('./x', './/x') are scoped to self; an absolute one searches the whole document
+            if child.value.startswith('./'):
+                return Locator(By.XPATH, self.value + child.value[1:])
+        return None
 
 class WaitCondition:
     ELEMENT_TO_BE_CLICKABLE = 'element_to_be_clickable'
@@ -47,7 +106,43 @@ class WaitCondition:
     VISIBILITY_OF = 'visibility_of'
 
 
+@lru_cache(maxsize=None)
+def _wait_condition_map() -> Mapping[str, Callable]:
+    # built on first use, so importing the ports doesn't load selenium's support package
+    from selenium.webdriver.support import expected_conditions as EC
+    return MappingProxyType({
+        WaitCondition.ELEMENT_TO_BE_CLICKABLE: EC.element_to_be_clickable,
+        WaitCondition.PRESENCE_OF_ELEMENT_LOCATED: EC.presence_of_element_located,
+        WaitCondition.PRESENCE_OF_ALL_ELEMENTS_LOCATED: EC.presence_of_all_elements_located,
+        WaitCondition.VISIBILITY_OF_ELEMENT_LOCATED: EC.visibility_of_element_located,
+        WaitCondition.VISIBILITY_OF_ALL_ELEMENTS_LOCATED: EC.visibility_of_all_elements_located,
+        WaitCondition.ELEMENT_LOCATED_SELECTION_STATE_TO_BE: EC.element_located_selection_state_to_be,
+        WaitCondition.ELEMENT_SELECTION_STATE_TO_BE: EC.element_selection_state_to_be,
+        WaitCondition.FRAME_TO_BE_AVAILABLE_AND_SWITCH_TO_IT: EC.frame_to_be_available_and_switch_to_it,
+        WaitCondition.INVISIBILITY_OF_ELEMENT: EC.invisibility_of_element,
+        WaitCondition.INVISIBILITY_OF_ELEMENT_LOCATED: EC.invisibility_of_element_located,
+        WaitCondition.STALENESS_OF: EC.staleness_of,
+        WaitCondition.TEXT_TO_BE_PRESENT_IN_ELEMENT: EC.text_to_be_present_in_element,
+        WaitCondition.TEXT_TO_BE_PRESENT_IN_ELEMENT_VALUE: EC.text_to_be_present_in_element_value,
+        WaitCondition.TITLE_CONTAINS: EC.title_contains,
+        WaitCondition.TITLE_IS: EC.title_is,
+        WaitCondition.URL_CONTAINS: EC.url_contains,
+        WaitCondition.URL_MATCHES: EC.url_matches,
+        WaitCondition.URL_TO_BE: EC.url_to_be,
+        WaitCondition.VISIBILITY_OF: EC.visibility_of,
+    })
+
+
+def resolve_wait_condition(condition: str) -> Callable:
+    # unknown names fall back to plain presence, as find_element always has
+    conditions = _wait_condition_map()
+    return conditions.get(condition) or conditions[WaitCondition.PRESENCE_OF_ELEMENT_LOCATED]
+
+
 class BrowserSessionPort(ABC):
+    # seconds the driver itself waits for elements; 0 means explicit waits only
+    implicit_wait: float = 0
+
     @abstractmethod
     def open(self, browser_type: str, options: Any, connection: Dict[str, Any]):
         pass
@@ -56,6 +151,11 @@ class BrowserSessionPort(ABC):
     def close(self) -> None:
         pass
 
+    @abstractmethod
+    def reset(self) -> None:
+        """Clears cookies and storage of the origins visited, restores default timeouts and blanks the current tab so the driver can be handed to another profile; raises when it can't"""
+        pass
+
     @abstractmethod
     def new_tab(self) -> str:
         """Opens a new tab and returns its window handle"""
@@ -73,27 +173,115 @@ class BrowserSessionPort(ABC):
     def execute_cdp(self, cmd: str, params: Dict[str, Any]) -> Any:
         pass
 
+    @abstractmethod
+    def execute_cdp_batch(self, commands: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """Runs the (method, params) pairs in order and returns their results, pipelined where the browser allows"""
+        pass
+
     @abstractmethod
     def execute(self, command: str, params: Dict[str, Any]) -> Any:
         pass
 
+    @abstractmethod
+    def execute_script(self, script: str, *args: Any) -> Any:
+        pass
+
+    @abstractmethod
+    def scroll_into_view(self, element: Any) -> None:
+        pass
+
+    @abstractmethod
+    def set_element_value(self, element: Any, text: str) -> None:
+        """Replaces the element's value with one script call instead of clear + send_keys"""
+        pass
+
+    @abstractmethod
+    def fill_fields(self, fields: Dict[Locator, str], root_element: Optional[Any] = None) -> List[Locator]:
+        """Sets the value of every field in one call and returns the locators that matched nothing"""
+        pass
+
+    @abstractmethod
+    def elements_present(self, locators: Dict[str, Locator]) -> Dict[str, bool]:
+        """Checks every named locator in one call"""
+        pass
+
+    @abstractmethod
+    def still_matches(self, element: Any, locator: Locator, root_element: Optional[Any] = None, enabled: bool = False) -> bool:
+        """Checks in one call that a located element is still attached, matched by the locator and visible (and enabled)"""
+        pass
+
+    @abstractmethod
+    def enable_implicit_wait(self, seconds: float) -> None:
+        pass
+
+    @abstractmethod
+    def disable_implicit_wait(self) -> None:
+        pass
+
+    @abstractmethod
+    def find_element_implicit(self, locator: Locator, root_element: Optional[Any] = None) -> Any:
+        """Single find_element call that relies on the driver's implicit wait instead of polling"""
+        pass
+
+    @abstractmethod
+    def find_elements_scalars(
+        self,
+        locator: Locator,
+        fields: List[str],
+        root_element: Optional[Any] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[List[Any]]:
+        """Like find_elements_attributes, but each match is a list of values in the order of fields"""
+        pass
+
+    @abstractmethod
+    def find_elements_attributes(
+        self,
+        locator: Locator,
+        attributes: List[str],
+        root_element: Optional[Any] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Reads the given attributes of every match (or the offset/limit slice of them) in one call, without waiting"""
+        pass
+
+    @abstractmethod
+    def wait_for_presence(self, locator: Locator, present: bool = True, timeout: int = 10) -> bool:
+        """Blocks until the locator matches (or stops matching); False on timeout"""
+        pass
+
     @abstractmethod
     def find_element(
         self, 
         locator: Locator, 
         timeout: int = 10, 
         condition: str = WaitCondition.PRESENCE_OF_ELEMENT_LOCATED,
-        root_element: Optional[Any] = None
+        root_element: Optional[Any] = None,
+        poll_frequency: Optional[float] = None
     ) -> Any:
         pass
 
+    @abstractmethod
+    def make_waiter(
+        self,
+        locator: Locator,
+        condition: str = WaitCondition.PRESENCE_OF_ELEMENT_LOCATED,
+        timeout: int = 10,
+        poll_frequency: Optional[float] = None
+    ) -> Callable[[], Any]:
+        """Returns a reusable callable that runs the wait and gives the element, or None on timeout"""
+        pass
+
     @abstractmethod
     def find_elements(
         self, 
         locator: Locator, 
         timeout: int = 10, 
         scroll_into_view: bool = False,
-        root_element: Optional[Any] = None
+        root_element: Optional[Any] = None,
+        poll_frequency: Optional[float] = None
     ) -> List[Any]:
 
         pass
\ No newline at end of file
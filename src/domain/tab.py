@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import NamedTuple
 
 
 class DefaultTabStatus(Enum):
@@ -6,7 +7,15 @@ class DefaultTabStatus(Enum):
     INACTIVE = 'inactive'
 
 
+class TabInfo(NamedTuple):
+    name: str
+    window_handle: str
+    status: DefaultTabStatus
+
+
 class Tab:
+    __slots__ = ('name', 'window_handle', 'status')
+
     def __init__(self, name: str, window_handle: str, status: DefaultTabStatus):
         self.name = name
         self.window_handle = window_handle
@@ -19,7 +28,7 @@ class Tab:
         self.status = new_status
 
     def is_active(self) -> bool:
-        return self.status == DefaultTabStatus.ACTIVE
+        return self.status is DefaultTabStatus.ACTIVE
 
     def __str__(self):
         return f"Tab(name={self.name}, status={self.status}, window_handle={self.window_handle})"
@@ -33,9 +42,6 @@ class Tab:
         # driver.switch_to.window(self.window_handle)
         # driver.close()
 
-    def get_info(self):
-        return {
-            "name": self.name,
-            "window_handle": self.window_handle,
-            "status": self.status
-        }
+    def get_info(self) -> TabInfo:
+        # a snapshot tuple; use ._asdict() where a dict is needed
+        return TabInfo(self.name, self.window_handle, self.status)
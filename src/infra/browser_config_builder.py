@@ -1,72 +1,254 @@
 # --- infra/browser_config_builder.py ---
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
+from functools import lru_cache
+from importlib import import_module
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
 import os
 
+from ..utils.settings import CACHE_DIR
+
+ARG_HEADLESS = "--headless"
+ARG_DISABLE_GPU = "--disable-gpu"
+ARG_DISABLE_EXTENSIONS = "--disable-extensions"
+ARG_DISABLE_IMAGES = "--blink-settings=imagesEnabled=false"
+ARG_NO_SANDBOX = "--no-sandbox"
+ARG_DISABLE_DEV_SHM = "--disable-dev-shm-usage"
+ARG_INCOGNITO = "--incognito"
+# checked again by DriverCreator, firefox has no such flag and is maximized after start
+ARG_START_MAXIMIZED = "--start-maximized"
+
+# entries a running browser keeps in its profile dir: chromium's SingletonLock, firefox's lock / parent.lock
+PROFILE_LOCK_FILES = ('SingletonLock', 'lock', 'parent.lock')
+# set by pytest-xdist per worker; stable across runs, unlike a pid
+WORKER_ID_ENV = 'PYTEST_XDIST_WORKER'
+
+SET_ARGS_KEYS = frozenset({'argument', 'experimental_options', 'capabilities'})
+
+# options classes are imported on first use, so importing this module doesn't load selenium
+BROWSER_OPTIONS_MODULES = MappingProxyType({
+    "chrome": "selenium.webdriver.chrome.options",
+    "firefox": "selenium.webdriver.firefox.options",
+    "edge": "selenium.webdriver.edge.options"
+})
+
+
+@lru_cache(maxsize=None)
+def _get_options_class(browser_name: str):
+    return import_module(BROWSER_OPTIONS_MODULES[browser_name]).Options
+
+
+def _ensure_dir(path: str):
+    # profile/cache dirs usually exist after the first run: one stat instead of a mkdir attempt per level
+    if not os.path.isdir(path):
+        os.makedirs(path, exist_ok=True)
+
+
+def _profile_in_use(path: str) -> bool:
+    for name in PROFILE_LOCK_FILES:
+        lock = os.path.join(path, name)
+        if not os.path.lexists(lock):
+            continue
+        # the symlink forms point at "<host>-<pid>" (chromium) or "<ip>:+<pid>" (firefox); a dead pid is a stale lock
+        try:
+            pid = int(os.readlink(lock).replace('+', '-').rsplit('-', 1)[-1])
+        except (OSError, ValueError):
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            continue
+        except OSError:
+            pass
+        return True
+    return False
+
+
+def persistent_profile_dir(root: str, name: str) -> str:
+    # the same dir on every run, so its cache stays warm; parallel workers each get their own by worker id,
+    # and only when the dir is locked by a browser still running is a per-process one used instead
+    worker = os.environ.get(WORKER_ID_ENV)
+    path = os.path.abspath(os.path.join(root, f'{name}-{worker}' if worker else name))
+    if _profile_in_use(path):
+        path = f'{path}-{os.getpid()}'
+    return path
+
+
 class BrowserConfigBuilder:
-    BROWSER_OPTIONS_MAP = {
-        "chrome": ChromeOptions,
-        "firefox": FirefoxOptions,
-        "edge": EdgeOptions
-    }
+    BROWSER_OPTIONS_MODULES = BROWSER_OPTIONS_MODULES
 
     def __init__(self, browser_name: str):
         self.browser_name = browser_name.lower()
-        self.options = self._initialize_options()
+        self.options_class = self._initialize_options()
+        # the fluent chain is only recorded here; selenium options are created once, in build()
+        # one entry per flag name, holding the flag and any value tokens that follow it ("-profile", "<dir>")
+        self._arguments: Dict[str, Tuple[str, ...]] = {}
+        self.preferences: Dict[str, Any] = {}
+        self.page_load_strategy: Optional[str] = None
+        self.experimental_options: Dict[str, Any] = {}
+        self.capabilities: Dict[str, Any] = {}
+        # values above can be unhashable (nested dicts), so build() keys on a change counter for them
+        self._extras_version = 0
+        self._built_key: Optional[tuple] = None
+        self._built = None
+        self._built_arguments = 0
 
     def _initialize_options(self):
-        options_class = self.BROWSER_OPTIONS_MAP.get(self.browser_name)
-        if not options_class:
+        if self.browser_name not in BROWSER_OPTIONS_MODULES:
             raise ValueError(f"Unsupported browser: {self.browser_name}")
-        return options_class()
+        return _get_options_class(self.browser_name)
+
+    @property
+    def arguments(self) -> List[str]:
+        return [token for entry in self._arguments.values() for token in entry]
+
+    def _add_argument(self, argument: str, *values: str):
+        # chained or repeated setters would otherwise hand chrome the same flag several times;
+        # a flag given again with another value ("--window-size=...", "-profile <dir>") keeps the last one
+        self._arguments[argument.split('=', 1)[0]] = (argument,) + values
+
+    def _add_arguments(self, tokens: List[str]):
+        # value tokens ("-width", "800") stay with the flag before them
+        entry: List[str] = []
+        for token in tokens:
+            if token.startswith('-') and entry:
+                self._add_argument(*entry)
+                entry = []
+            entry.append(token)
+        if entry:
+            self._add_argument(*entry)
 
     def set_headless(self):
-        self.options.add_argument("--headless")
+        self._add_argument(ARG_HEADLESS)
         return self
 
     def set_fullscreen(self):
-        self.options.add_argument("--start-maximized")
+        self._add_argument(ARG_START_MAXIMIZED)
         return self
 
     def set_window_size(self, width: int, height: int):
-        self.options.add_argument(f"--window-size={width},{height}")
+        self._add_argument(f"--window-size={width},{height}")
         return self
 
     def disable_gpu(self):
-        self.options.add_argument("--disable-gpu")
+        self._add_argument(ARG_DISABLE_GPU)
+        return self
+
+    def disable_extensions(self):
+        self._add_argument(ARG_DISABLE_EXTENSIONS)
+        return self
+
+    def disable_images(self):
+        # skip image downloads/decoding when the run doesn't look at pixels
+        if self.browser_name in ['chrome', 'edge']:
+            self._add_argument(ARG_DISABLE_IMAGES)
+        elif self.browser_name == 'firefox':
+            self.preferences['permissions.default.image'] = 2
         return self
 
     def set_no_sandbox(self):
-        self.options.add_argument("--no-sandbox")
+        self._add_argument(ARG_NO_SANDBOX)
         return self
 
     def disable_dev_shm_usage(self):
-        self.options.add_argument("--disable-dev-shm-usage")
+        self._add_argument(ARG_DISABLE_DEV_SHM)
         return self
 
     def set_incognito(self):
-        self.options.add_argument("--incognito")
+        self._add_argument(ARG_INCOGNITO)
         return self
 
     def set_user_agent(self, user_agent: str):
-        self.options.add_argument(f"--user-agent={user_agent}")
+        self._add_argument(f"--user-agent={user_agent}")
         return self
 
-    def set_browser_profile(self, path: str):
+    def set_page_load_strategy(self, strategy: str):
+        if strategy not in ('normal', 'eager', 'none'):
+            raise ValueError(f"Unsupported page load strategy: {strategy}")
+        self.page_load_strategy = strategy
+        return self
+
+    def enable_disk_cache(self, path: str, size_bytes: int = 256 * 1024 * 1024):
+        # keep the http cache in a fixed directory so warm runs skip re-downloading static assets
+        _ensure_dir(path)
         if self.browser_name in ['chrome', 'edge']:
-            self.options.add_argument(f'--user-data-dir={path}')
-            os.makedirs(path, exist_ok=True)
+            self._add_argument(f'--disk-cache-dir={path}')
+            self._add_argument(f'--disk-cache-size={size_bytes}')
         elif self.browser_name == 'firefox':
-            os.makedirs(path, exist_ok=True)
-            self.options.add_argument("-profile")
-            self.options.add_argument(path)
-        else:
+            self.preferences['network.http.use-cache'] = True
+            self.preferences['browser.cache.disk.enable'] = True
+            self.preferences['browser.cache.disk.parent_directory'] = path
+            self.preferences['browser.cache.disk.capacity'] = size_bytes // 1024
+        return self
+
+    def set_browser_profile(self, path: str):
+        if self.browser_name not in ('chrome', 'edge', 'firefox'):
             raise ValueError(
                 f"Profile configuration is only supported for Chrome, Edge, or Firefox browsers. "
                 f"Current browser: {self.browser_name}"
             )
+        path = os.path.abspath(path)
+        _ensure_dir(path)
+        if self.browser_name == 'firefox':
+            self._add_argument('-profile', path)
+        else:
+            self._add_argument(f'--user-data-dir={path}')
+        return self
+
+    def set_persistent_cache(self):
+        # a long-lived profile keeps the http/service-worker cache warm between runs
+        return self.set_browser_profile(persistent_profile_dir(str(CACHE_DIR), f'{self.browser_name}-profile'))
+
+    def set_args(self, args: Dict[str, Any]):
+        # bulk form of the setters: {'argument': [...], 'experimental_options': {...}, 'capabilities': {...}}
+        # everything is checked before anything is applied, so a bad call leaves the builder as it was
+        unknown = set(args) - SET_ARGS_KEYS
+        if unknown:
+            raise ValueError(f"Unknown option groups: {sorted(unknown)}. Must be among {sorted(SET_ARGS_KEYS)}")
+        arguments = args.get('argument', ())
+        if isinstance(arguments, str) or not all(isinstance(argument, str) for argument in arguments):
+            raise ValueError(f"'argument' must be a list of strings, got {arguments!r}")
+        experimental_options = args.get('experimental_options', {})
+        capabilities = args.get('capabilities', {})
+        for group, value in (('experimental_options', experimental_options), ('capabilities', capabilities)):
+            if not isinstance(value, dict):
+                raise ValueError(f"'{group}' must be a dict, got {type(value).__name__}")
+        if experimental_options and self.browser_name not in ('chrome', 'edge'):
+            raise ValueError(f"Experimental options are only supported for Chrome or Edge. Current browser: {self.browser_name}")
+        self._add_arguments(arguments)
+        self.experimental_options.update(experimental_options)
+        self.capabilities.update(capabilities)
+        self._extras_version += 1
         return self
 
     def build(self):
-        return self.options
\ No newline at end of file
+        arguments = self.arguments
+        key = (tuple(arguments), tuple(sorted(self.preferences.items())), self.page_load_strategy, self._extras_version)
+        if self._built is not None:
+            if key == self._built_key:
+                return self._built
+            # flags added straight onto the last built object (builder.options.add_argument) carry over to the new one
+            extra = self._built.arguments[self._built_arguments:]
+            if extra:
+                self._add_arguments(extra)
+                arguments = self.arguments
+                key = (tuple(arguments),) + key[1:]
+        options = self.options_class()
+        for argument in arguments:
+            options.add_argument(argument)
+        for name, value in self.preferences.items():
+            options.set_preference(name, value)
+        if self.page_load_strategy:
+            options.page_load_strategy = self.page_load_strategy
+        for name, value in self.experimental_options.items():
+            options.add_experimental_option(name, value)
+        for name, value in self.capabilities.items():
+            options.set_capability(name, value)
+        self._built_key = key
+        self._built = options
+        self._built_arguments = len(options.arguments)
+        return options
+
+    @property
+    def options(self):
+        # the live selenium options object, as when this was a plain attribute; build() returns the same one
+        return self.build()
\ No newline at end of file
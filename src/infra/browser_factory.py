@@ -1,23 +1,56 @@
-from typing import Any
+import os
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, List, Tuple
 
 from .driver_creator import DriverCreator
 from ..utils.exceptions import BrowserInitializationError
 from ..utils.logger import logger
 
 
+_DRIVER_MAP = MappingProxyType({
+    "chrome": DriverCreator.create_chrome_driver,
+    "firefox": DriverCreator.create_firefox_driver,
+    "remote": DriverCreator.create_remote_driver,
+    "attach": DriverCreator.attach_driver,
+})
+
+
 class BrowserFactory:
-    def __init__(self):
-        self.driver_map = {
-            "chrome": DriverCreator.create_chrome_driver,
-            "firefox": DriverCreator.create_firefox_driver,
-            "remote": DriverCreator.create_remote_driver,
-        }
+    # shared, read-only dispatch table; kept as an attribute for callers that read it
+    driver_map = _DRIVER_MAP
 
     def create_browser(self, browser_type: str, options: Any, connection: dict):
         browser_type = browser_type.lower()
-        creator = self.driver_map.get(browser_type)
+        creator = _DRIVER_MAP.get(browser_type)
         if not creator:
             raise BrowserInitializationError(browser_type)
         
-        logger.info(f'request to create driver with type=({browser_type}), connection=({connection})')
-        return creator(options, connection)
\ No newline at end of file
+        logger.info('request to create driver with type=(%s), connection=(%s)', browser_type, connection)
+        return creator(options, connection)
+
+    def create_browsers(self, requests: List[Tuple[str, Any, dict]]) -> List[Any]:
+        # driver start-up is process spawn + handshake, so n browsers start in roughly the time of one
+        if not requests:
+            return []
+        workers = min(len(requests), (os.cpu_count() or 1) * 2)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.create_browser, *request) for request in requests]
+        drivers, error = [], None
+        for (browser_type, _, _), future in zip(requests, futures):
+            try:
+                drivers.append(future.result())
+            except BrowserInitializationError as e:
+                error = error or e
+            except Exception as e:
+                error = error or BrowserInitializationError(browser_type, f"Unexpected error: {e}")
+        if error:
+            # all or nothing: don't leave the browsers that did start running unowned
+            for driver in drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    # keep quitting the rest; the start-up error is the one to report
+                    logger.warning('could not quit driver after a failed bulk start.', exc_info=True)
+            raise error
+        return drivers
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from ..core.ports import BrowserSessionPort
+
+# cdp reads whose answer can't change while the browser process lives
+READ_ONLY_CDP_METHODS = frozenset({
+    'Browser.getVersion',
+    'Browser.getBrowserCommandLine',
+    'SystemInfo.getInfo',
+    'Schema.getDomains',
+})
+
+
+class CachedCdp:
+    CACHE_SIZE = 256
+
+    def __init__(self, session: BrowserSessionPort):
+        self.session = session
+        self._cache: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def execute(self, cmd: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        params = params or {}
+        if cmd not in READ_ONLY_CDP_METHODS:
+            # anything else may change browser state, so drop what we know
+            self.invalidate()
+            return self.session.execute_cdp(cmd, params)
+        try:
+            key = (cmd, frozenset(params.items()))
+        except TypeError:
+            # nested params aren't hashable, just pass through
+            return self.session.execute_cdp(cmd, params)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        self.misses += 1
+        result = self.session.execute_cdp(cmd, params)
+        self._cache[key] = result
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    def invalidate(self):
+        self._cache.clear()
+
+    def cache_info(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'maxsize': self.CACHE_SIZE,
+            'currsize': len(self._cache),
+        }
@@ -0,0 +1,49 @@
+import json
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+from selenium.common.exceptions import WebDriverException
+
+# capability keys under which chromium drivers report the browser's devtools host:port
+DEBUGGER_CAPABILITIES = ('goog:chromeOptions', 'ms:edgeOptions')
+
+
+def debugger_address(capabilities: Dict[str, Any]) -> Optional[str]:
+    for key in DEBUGGER_CAPABILITIES:
+        address = (capabilities.get(key) or {}).get('debuggerAddress')
+        if address:
+            return address
+    return None
+
+
+def target_websocket_url(address: str, target_id: str, timeout: float = 5) -> Optional[str]:
+    # chromedriver window handles are devtools target ids
+    with urllib.request.urlopen(f'http://{address}/json/list', timeout=timeout) as response:
+        targets = json.load(response)
+    for target in targets:
+        if target.get('id') == target_id:
+            return target.get('webSocketDebuggerUrl')
+    return None
+
+
+def connect(ws_url: str, timeout: float = 30):
+    import websocket  # websocket-client, installed with selenium
+    # no Origin header, so chrome's --remote-allow-origins check doesn't reject us
+    return websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+
+
+def pipeline(connection, commands: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+    # send everything first, then collect the replies by id; events interleaved with them are skipped
+    for message_id, (method, params) in enumerate(commands, start=1):
+        connection.send(json.dumps({'id': message_id, 'method': method, 'params': params}))
+    results: Dict[int, Any] = {}
+    while len(results) < len(commands):
+        message = json.loads(connection.recv())
+        message_id = message.get('id')
+        if message_id is None:
+            continue
+        if 'error' in message:
+            method = commands[message_id - 1][0]
+            raise WebDriverException(f"CDP {method} failed: {message['error'].get('message')}")
+        results[message_id] = message.get('result', {})
+    return [results[message_id] for message_id in range(1, len(commands) + 1)]
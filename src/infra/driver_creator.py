@@ -8,11 +8,38 @@ from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 
 
+from .browser_config_builder import ARG_START_MAXIMIZED
 from ..utils.exceptions import BrowserInitializationError, DriverNotFoundError, BrowserConfigError
 from ..utils.logger import setup_logger
 
 logger = setup_logger("DriverCreator")
 
+# driver binaries already seen on disk; they don't move during a run, so each is stat'ed once
+_VALIDATED_BINARIES = set()
+
+
+def _check_binary(binary_path: str, driver_label: str):
+    if binary_path in _VALIDATED_BINARIES:
+        return
+    try:
+        os.stat(binary_path)
+    except FileNotFoundError:
+        logger.warning("%s binary not found at %s", driver_label, binary_path)
+        raise DriverNotFoundError(driver_label, f"Binary not found at {binary_path}")
+    _VALIDATED_BINARIES.add(binary_path)
+
+
+class _AttachedRemote(webdriver.Remote):
+    # binds to a session that is already running instead of asking the server for a new one
+    def __init__(self, session_id: str, **kwargs):
+        self._attach_session_id = session_id
+        super().__init__(**kwargs)
+
+    def start_session(self, capabilities: dict) -> None:
+        self.session_id = self._attach_session_id
+        self.caps = {}
+
+
 class DriverCreator:
     @staticmethod
     def create_chrome_driver(options: ChromeOptions, connection: dict) -> webdriver.Chrome:
@@ -21,12 +48,11 @@ class DriverCreator:
             if not binary_path:
                 logger.error("Chrome binary path is missing")
                 raise BrowserInitializationError("chrome", "Chrome binary path is missing")
-            if not os.path.exists(binary_path):
-                logger.warning(f"ChromeDriver binary not found at {binary_path}")
-                raise DriverNotFoundError("ChromeDriver", f"Binary not found at {binary_path}")
+            _check_binary(binary_path, "ChromeDriver")
             driver = webdriver.Chrome(
                 service=ChromeService(executable_path=binary_path),
-                options=options
+                options=options,
+                keep_alive=connection.get('keep_alive', True)
             )
             logger.info("Chrome driver created")
             return driver
@@ -47,16 +73,15 @@ class DriverCreator:
             if not binary_path:
                 logger.error("Firefox binary path is missing")
                 raise BrowserInitializationError("firefox", "Firefox binary path is missing")
-            if not os.path.exists(binary_path):
-                logger.warning(f"GeckoDriver binary not found at {binary_path}")
-                raise DriverNotFoundError("GeckoDriver", f"Binary not found at {binary_path}")
+            _check_binary(binary_path, "GeckoDriver")
 
             driver = webdriver.Firefox(
                 service=FirefoxService(executable_path=binary_path),
-                options=options
+                options=options,
+                keep_alive=connection.get('keep_alive', True)
             )
             
-            if "--start-maximized" in options.arguments:
+            if ARG_START_MAXIMIZED in options.arguments:
                 driver.maximize_window()
             logger.info("Firefox driver created")
             return driver
@@ -78,7 +103,12 @@ class DriverCreator:
             if not remote_url:
                 logger.error("Remote URL missing")
                 raise BrowserConfigError("Remote URL required")
-            driver = webdriver.Remote(command_executor=remote_url, options=options)
+            # a pooled keep-alive connection saves a tcp (and tls) handshake per command against the grid
+            driver = webdriver.Remote(
+                command_executor=remote_url,
+                options=options,
+                keep_alive=connection.get('keep_alive', True)
+            )
             logger.info("Remote driver created")
             return driver
         except WebDriverException as e:
@@ -88,3 +118,26 @@ class DriverCreator:
             logger.critical("Critical error", exc_info=True)
             raise BrowserInitializationError('remote', f"Critical error: {e}")
 
+    @staticmethod
+    def attach_driver(options: Any, connection: dict) -> webdriver.Remote:
+        # reuses a driver started elsewhere (another process or an earlier run); quitting it ends that session too
+        try:
+            remote_url = connection.get('remote_url', '')
+            session_id = connection.get('session_id', '')
+            if not remote_url or not session_id:
+                logger.error("Remote URL or session id missing")
+                raise BrowserConfigError("Remote URL and session id required to attach")
+            driver = _AttachedRemote(
+                session_id,
+                command_executor=remote_url,
+                options=options,
+                keep_alive=connection.get('keep_alive', True)
+            )
+            logger.info("Attached to session %s", session_id)
+            return driver
+        except WebDriverException as e:
+            logger.error("WebDriver exception", exc_info=True)
+            raise BrowserInitializationError('attach', f"Unexpected error: {e}")
+        except Exception as e:
+            logger.critical("Critical error", exc_info=True)
+            raise BrowserInitializationError('attach', f"Critical error: {e}")
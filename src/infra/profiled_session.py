@@ -0,0 +1,46 @@
+import time
+from collections import Counter
+from functools import wraps
+from typing import Any, Dict
+
+from ..core.ports import BrowserSessionPort
+
+
+class ProfiledSession:
+    """Delegates to a session and records call count and wall time per method"""
+
+    def __init__(self, session: BrowserSessionPort):
+        self._session = session
+        self.calls: Counter = Counter()
+        self.total_ns: Counter = Counter()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._session, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @wraps(attr)
+        def timed(*args, **kwargs):
+            # cdp calls are broken down by command, they differ by orders of magnitude
+            key = f'{name}:{args[0]}' if name == 'execute_cdp' and args else name
+            start = time.perf_counter_ns()
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self.calls[key] += 1
+                self.total_ns[key] += time.perf_counter_ns() - start
+        return timed
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        return {
+            key: {
+                'calls': count,
+                'total_ms': self.total_ns[key] / 1e6,
+                'avg_ms': self.total_ns[key] / count / 1e6,
+            }
+            for key, count in self.calls.most_common()
+        }
+
+    def reset_stats(self):
+        self.calls.clear()
+        self.total_ns.clear()
@@ -0,0 +1,164 @@
+# --- infra/scripts.py ---
+from typing import Tuple
+
+from selenium.webdriver.common.by import By
+
+from ..core.ports import Locator
+
+
+# resolves a (using, value) pair to a node array inside the browser, so bulk reads/writes take a single execute_script
+LOCATE_ALL_JS = """
+function locateAll(using, value, root) {
+    root = root || document;
+    if (using === 'xpath') {
+        const snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) {
+            nodes.push(snapshot.snapshotItem(i));
+        }
+        return nodes;
+    }
+    if (using === 'link text' || using === 'partial link text') {
+        return Array.from(root.querySelectorAll('a')).filter(function (a) {
+            const text = a.innerText.trim();
+            return using === 'link text' ? text === value : text.indexOf(value) !== -1;
+        });
+    }
+    return Array.from(root.querySelectorAll(value));
+}
+"""
+
+# uses the native value setter so frameworks that track input values (react, vue) see the change
+SET_NATIVE_VALUE_JS = """
+function setNativeValue(el, value) {
+    let proto = HTMLInputElement.prototype;
+    if (el instanceof HTMLTextAreaElement) {
+        proto = HTMLTextAreaElement.prototype;
+    } else if (el instanceof HTMLSelectElement) {
+        proto = HTMLSelectElement.prototype;
+    }
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+"""
+
+SET_VALUE_JS = SET_NATIVE_VALUE_JS + """
+setNativeValue(arguments[0], arguments[1]);
+"""
+
+FILL_FIELDS_JS = LOCATE_ALL_JS + SET_NATIVE_VALUE_JS + """
+const fields = arguments[0];
+const root = arguments[1];
+const missing = [];
+fields.forEach(function (field, index) {
+    const el = locateAll(field[0], field[1], root)[0];
+    if (!el) {
+        missing.push(index);
+        return;
+    }
+    setNativeValue(el, field[2]);
+});
+return missing;
+"""
+
+PRESENCE_MAP_JS = LOCATE_ALL_JS + """
+const queries = arguments[0];
+const found = {};
+Object.keys(queries).forEach(function (name) {
+    found[name] = locateAll(queries[name][0], queries[name][1]).length > 0;
+});
+return found;
+"""
+
+SCROLL_INTO_VIEW_JS = """
+arguments[0].scrollIntoView({block: 'center'});
+"""
+
+# the whole list in one call; a detached node is skipped instead of failing the batch
+SCROLL_ALL_INTO_VIEW_JS = """
+arguments[0].forEach(function (el) {
+    try {
+        el.scrollIntoView({block: 'center'});
+    } catch (e) {}
+});
+"""
+
+# property first, attribute as fallback - the same lookup order as WebElement.get_attribute;
+# rows are positional arrays so the payload doesn't repeat every field name per match
+SCALARS_JS = LOCATE_ALL_JS + """
+const offset = arguments[4] || 0;
+const end = arguments[5] == null ? undefined : offset + arguments[5];
+const nodes = locateAll(arguments[0], arguments[1], arguments[2]).slice(offset, end);
+const names = arguments[3];
+return nodes.map(function (node) {
+    return names.map(function (name) {
+        let value = node[name];
+        if (value === undefined || typeof value === 'object' || typeof value === 'function') {
+            value = node.getAttribute(name);
+        }
+        return value;
+    });
+});
+"""
+
+# re-checks a previously located element in one call: still in the page, still matched by the locator,
+# visible, and (for clickable) enabled. root is the element the original search ran under, if any
+STILL_MATCHES_JS = LOCATE_ALL_JS + """
+const el = arguments[0];
+const using = arguments[1];
+const value = arguments[2];
+const root = arguments[3];
+const enabled = arguments[4];
+if (!el.isConnected || (root && !root.contains(el))) {
+    return false;
+}
+const matches = using === 'css selector' ? el.matches(value) : locateAll(using, value, root).indexOf(el) !== -1;
+if (!matches) {
+    return false;
+}
+const style = window.getComputedStyle(el);
+const visible = el.getClientRects().length > 0 && style.visibility !== 'hidden' && style.opacity !== '0';
+return visible && (!enabled || !el.disabled);
+"""
+
+# async script: resolves as soon as a dom mutation makes the locator (dis)appear, rather than polling over the wire
+WAIT_FOR_PRESENCE_JS = LOCATE_ALL_JS + """
+const using = arguments[0];
+const value = arguments[1];
+const present = arguments[2];
+const timeout = arguments[3];
+const done = arguments[arguments.length - 1];
+function settled() {
+    return (locateAll(using, value).length > 0) === present;
+}
+if (settled()) {
+    done(true);
+    return;
+}
+const observer = new MutationObserver(function () {
+    if (settled()) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(true);
+    }
+});
+const timer = setTimeout(function () {
+    observer.disconnect();
+    done(false);
+}, timeout);
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+"""
+
+
+def to_js_locator(locator: Locator) -> Tuple[str, str]:
+    """Rewrites id/name/class/tag locators to css, the same way selenium's remote driver does."""
+    if locator.by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{locator.value}"]'
+    if locator.by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{locator.value}"]'
+    if locator.by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f'.{locator.value}'
+    if locator.by == By.TAG_NAME:
+        return By.CSS_SELECTOR, locator.value
+    return locator.as_tuple()
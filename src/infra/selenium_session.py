@@ -1,131 +1,435 @@
-from typing import Any, Dict, List, Optional
+import weakref
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException
 
-from ..core.ports import BrowserSessionPort, Locator, WaitCondition
+from ..core.ports import BrowserSessionPort, Locator, WaitCondition, resolve_wait_condition
+from . import devtools
 from .browser_factory import BrowserFactory
+from .scripts import (
+    FILL_FIELDS_JS, PRESENCE_MAP_JS, SCALARS_JS, SCROLL_ALL_INTO_VIEW_JS, SCROLL_INTO_VIEW_JS,
+    SET_VALUE_JS, STILL_MATCHES_JS, WAIT_FOR_PRESENCE_JS, to_js_locator
+)
 from ..utils.logger import logger
 
+if TYPE_CHECKING:
+    from selenium.webdriver.support.ui import WebDriverWait
+
+# WebDriverWait polls every 0.5s by default; every poll of a remote grid is an extra rpc, so those get a wider interval
+LOCAL_POLL_FREQUENCY = 0.05
+REMOTE_POLL_FREQUENCY = 0.25
+# below this many commands a batch goes through execute_cdp_cmd; a devtools socket only pays off for bigger ones
+CDP_BATCH_MIN = 4
+
+
+def _quit_driver(driver):
+    # safety net for sessions dropped without close(); runs at gc or interpreter exit, not in a __del__.
+    # the driver may already be half torn down by then, and nobody is left to handle an error
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+def _origin(url: str) -> Optional[str]:
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return None
+    return f'{parts.scheme}://{parts.netloc}'
+
+
 class SeleniumSession(BrowserSessionPort):
     def __init__(self):
         self.driver = None
         self.factory = BrowserFactory()
+        self.poll_frequency = 0.1
+        self.implicit_wait = 0
+        # handle the driver is focused on, as far as this session knows; None means unknown
+        self.current_handle: Optional[str] = None
+        # w3c default script timeout; raised on demand for long async waits
+        self.script_timeout = 30
+        # WebDriverWait objects are bound to the driver, so they are reused per (timeout, poll) until it changes
+        self._waits: Dict[tuple, 'WebDriverWait'] = {}
+        self._finalizer: Optional[weakref.finalize] = None
+        # devtools sockets opened by execute_cdp_batch, kept per tab handle for the next batch
+        self._devtools: Dict[str, Any] = {}
+        # origins navigated to since the last reset, whose storage reset() has to clear
+        self._origins: Set[str] = set()
 
     def open(self, browser_type: str, options: Any, connection: Dict[str, Any]) -> None:
         logger.info('send initiate driver reqeuest to browser factory.')
         self.driver = self.factory.create_browser(browser_type, options, connection)
+        # an attached session belongs to whoever started it; dropping ours must not quit their browser
+        if browser_type.lower() != 'attach':
+            self._finalizer = weakref.finalize(self, _quit_driver, self.driver)
+        self.current_handle = None
+        self._waits.clear()
+        self._origins.clear()
+        self.poll_frequency = REMOTE_POLL_FREQUENCY if browser_type.lower() in ('remote', 'attach') else LOCAL_POLL_FREQUENCY
         logger.info('driver stored.')
 
     def close(self) -> None:
+        self._close_devtools()
+        if self._finalizer:
+            self._finalizer.detach()
+            self._finalizer = None
         if self.driver:
-            self.driver.quit()
-            self.driver = None
-    
-    def get(self, url: str) -> None:
+            try:
+                self.driver.quit()
+            finally:
+                # a driver whose process already died can't be quit cleanly; drop it either way
+                self.driver = None
+        self.implicit_wait = 0
+        self.script_timeout = 30
+        self.current_handle = None
+        self._waits.clear()
+        self._origins.clear()
+
+    def adopt(self, other: 'SeleniumSession') -> None:
+        # takes over other's running driver, so whoever owns this session also owns (and closes) that browser;
+        # other is left empty and its close() does nothing
+        self._close_devtools()
+        if self._finalizer:
+            self._finalizer.detach()
+            self._finalizer = None
+        self.driver, other.driver = other.driver, None
+        if other._finalizer:
+            other._finalizer.detach()
+            other._finalizer = None
+            self._finalizer = weakref.finalize(self, _quit_driver, self.driver)
+        self.poll_frequency = other.poll_frequency
+        self.implicit_wait, other.implicit_wait = other.implicit_wait, 0
+        self.script_timeout, other.script_timeout = other.script_timeout, 30
+        self.current_handle, other.current_handle = other.current_handle, None
+        self._devtools, other._devtools = other._devtools, {}
+        self._origins, other._origins = other._origins, set()
+        self._waits.clear()
+        other._waits.clear()
+
+    def __enter__(self) -> 'SeleniumSession':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @contextmanager
+    def _implicit_wait_suspended(self):
+        # an implicit wait left on makes every failed poll inside an explicit wait block that long
+        if not self.implicit_wait:
+            yield
+            return
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(self.implicit_wait)
+
+    def _wait(self, timeout: float, poll_frequency: Optional[float] = None) -> 'WebDriverWait':
+        key = (timeout, poll_frequency or self.poll_frequency)
+        wait = self._waits.get(key)
+        if wait is None:
+            from selenium.webdriver.support.ui import WebDriverWait
+            # a re-render between the locate and the clickable/visible check is retried on the next poll, not raised
+            wait = WebDriverWait(self.driver, key[0], poll_frequency=key[1], ignored_exceptions=(StaleElementReferenceException,))
+            self._waits[key] = wait
+        return wait
+
+    def reset(self) -> None:
         if not self.driver:
             raise WebDriverException("Driver not initialized")
-        self.driver.get(url)
+        origins = set(self._origins)
+        current = _origin(self.driver.current_url)
+        if current:
+            origins.add(current)
+        if hasattr(self.driver, 'execute_cdp_cmd'):
+            # chromium: cookies of every domain, then all storage (local/session, indexeddb, cache) of every origin
+            # we navigated to or that set a cookie. blank the page first so it can't write anything back meanwhile
+            self.driver.get('about:blank')
+            for cookie in self.driver.execute_cdp_cmd('Network.getAllCookies', {}).get('cookies', []):
+                domain = cookie.get('domain', '').lstrip('.')
+                if domain:
+                    origins.update((f'https://{domain}', f'http://{domain}'))
+            commands = [('Network.clearBrowserCookies', {})]
+            commands += [('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'}) for origin in sorted(origins)]
+            self.execute_cdp_batch(commands)
+        else:
+            # plain webdriver only reaches the current domain; with others visited the next profile would
+            # inherit their cookies and storage, so refuse and let the caller quit the driver instead
+            if origins - {current}:
+                raise WebDriverException(f"Cannot clear cookies and storage of {sorted(origins - {current})} without CDP")
+            self.driver.delete_all_cookies()
+            self.driver.execute_script('try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}')
+            self.driver.get('about:blank')
+        self._origins.clear()
+        # timeouts the previous profile changed must not carry over to the next one
+        if self.implicit_wait:
+            self.driver.implicitly_wait(0)
+            self.implicit_wait = 0
+        if self.script_timeout != 30:
+            self.driver.set_script_timeout(30)
+            self.script_timeout = 30
+        self._waits.clear()
+
+    def get(self, url: str, ready_locator: Optional[Locator] = None, timeout: int = 10, via_cdp: bool = False) -> bool:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        if via_cdp and hasattr(self.driver, 'execute_cdp_cmd'):
+            # returns once the navigation commits instead of blocking until the load event;
+            # pair it with ready_locator to wait for what the caller actually needs. chromium only
+            result = self.driver.execute_cdp_cmd('Page.navigate', {'url': url})
+            if result.get('errorText'):
+                raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+        else:
+            self.driver.get(url)
+        origin = _origin(url)
+        if origin:
+            self._origins.add(origin)
+        if ready_locator is None:
+            return True
+        # navigate and wait for the page's key element as one step; False when it didn't show up in time
+        return self.find_element(ready_locator, timeout=timeout, condition=WaitCondition.VISIBILITY_OF_ELEMENT_LOCATED) is not None
     
     def new_tab(self) -> str:
         if not self.driver:
             raise WebDriverException("Driver not initialized")
         self.driver.switch_to.new_window()
-        return self.driver.current_window_handle
+        self.current_handle = self.driver.current_window_handle
+        return self.current_handle
 
     def switch_tab(self, handle: str) -> None:
-        if self.driver:
+        # skip the round-trip when the driver is already on that tab
+        if self.driver and handle != self.current_handle:
             self.driver.switch_to.window(handle)
+            self.current_handle = handle
 
     def close_tab(self, handle: str) -> None:
         if self.driver:
-            self.driver.switch_to.window(handle)
+            self.switch_tab(handle)
+            self._close_devtools(handle)
             self.driver.close()
+            self.current_handle = None
 
     def execute_cdp(self, cmd: str, params: Dict[str, Any]) -> Any:
         if not self.driver:
             raise WebDriverException("Driver not initialized")
         return self.driver.execute_cdp_cmd(cmd, params)
 
+    def execute_cdp_batch(self, commands: List[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        commands = list(commands)
+        handle = self.driver.current_window_handle if len(commands) >= CDP_BATCH_MIN else None
+        connection = self._devtools_connection(handle) if handle else None
+        if connection is None:
+            return [self.driver.execute_cdp_cmd(cmd, params) for cmd, params in commands]
+        try:
+            return devtools.pipeline(connection, commands)
+        except Exception:
+            # unread replies or a dead socket would be picked up by the next batch, so start over next time
+            self._close_devtools(handle)
+            raise
+
+    def _devtools_connection(self, handle: str):
+        # a direct socket to the tab's devtools target, or None when it isn't reachable
+        # (firefox, or a grid node whose debugger port isn't exposed) and commands go one by one
+        connection = self._devtools.get(handle)
+        if connection is not None:
+            return connection
+        address = devtools.debugger_address(getattr(self.driver, 'capabilities', {}))
+        if not address:
+            return None
+        try:
+            ws_url = devtools.target_websocket_url(address, handle)
+            connection = devtools.connect(ws_url) if ws_url else None
+        except Exception:
+            logger.warning('devtools socket at %s unavailable, sending cdp commands one by one.', address, exc_info=True)
+            return None
+        if connection is not None:
+            self._devtools[handle] = connection
+        return connection
+
+    def _close_devtools(self, handle: Optional[str] = None) -> None:
+        # one tab's socket, or all of them
+        handles = [handle] if handle else list(self._devtools)
+        for key in handles:
+            connection = self._devtools.pop(key, None)
+            if connection is not None:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
     def execute(self, command: str, params: Dict[str, Any]) -> Any:
         if not self.driver:
             raise WebDriverException("Driver not initialized")
         return self.driver.execute(command, params)
 
+    def execute_script(self, script: str, *args: Any) -> Any:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        return self.driver.execute_script(script, *args)
+
+    def scroll_into_view(self, element: WebElement) -> None:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        self.driver.execute_script(SCROLL_INTO_VIEW_JS, element)
+
+    def set_element_value(self, element: WebElement, text: str) -> None:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        self.driver.execute_script(SET_VALUE_JS, element, text)
+
+    def fill_fields(self, fields: Dict[Locator, str], root_element: Optional[WebElement] = None) -> List[Locator]:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        locators = list(fields)
+        payload = [[*to_js_locator(locator), fields[locator]] for locator in locators]
+        missing = self.driver.execute_script(FILL_FIELDS_JS, payload, root_element)
+        return [locators[index] for index in missing]
+
+    def elements_present(self, locators: Dict[str, Locator]) -> Dict[str, bool]:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        queries = {name: to_js_locator(locator) for name, locator in locators.items()}
+        return self.driver.execute_script(PRESENCE_MAP_JS, queries)
+
+    def still_matches(self, element: WebElement, locator: Locator, root_element: Optional[WebElement] = None, enabled: bool = False) -> bool:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        using, value = to_js_locator(locator)
+        return bool(self.driver.execute_script(STILL_MATCHES_JS, element, using, value, root_element, enabled))
+
+    def find_elements_scalars(
+        self,
+        locator: Locator,
+        fields: List[str],
+        root_element: Optional[WebElement] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[List[Any]]:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        using, value = to_js_locator(locator)
+        return self.driver.execute_script(SCALARS_JS, using, value, root_element, list(fields), offset, limit)
+
+    def find_elements_attributes(
+        self,
+        locator: Locator,
+        attributes: List[str],
+        root_element: Optional[WebElement] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        attributes = list(attributes)
+        rows = self.find_elements_scalars(locator, attributes, root_element=root_element, offset=offset, limit=limit)
+        return [dict(zip(attributes, row)) for row in rows]
+
+    def wait_for_presence(self, locator: Locator, present: bool = True, timeout: int = 10) -> bool:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        using, value = to_js_locator(locator)
+        previous = self.script_timeout
+        if timeout + 1 <= previous:
+            return bool(self.driver.execute_async_script(WAIT_FOR_PRESENCE_JS, using, value, present, timeout * 1000))
+        # the script must outlive its own timer; raised for this call only, so later async scripts keep theirs
+        self.driver.set_script_timeout(timeout + 1)
+        self.script_timeout = timeout + 1
+        try:
+            return bool(self.driver.execute_async_script(WAIT_FOR_PRESENCE_JS, using, value, present, timeout * 1000))
+        finally:
+            self.driver.set_script_timeout(previous)
+            self.script_timeout = previous
+
+    def enable_implicit_wait(self, seconds: float) -> None:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        self.driver.implicitly_wait(seconds)
+        self.implicit_wait = seconds
+
+    def disable_implicit_wait(self) -> None:
+        if self.driver and self.implicit_wait:
+            self.driver.implicitly_wait(0)
+        self.implicit_wait = 0
+
+    def find_element_implicit(self, locator: Locator, root_element: Optional[WebElement] = None) -> Optional[WebElement]:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        try:
+            # the driver polls for the element itself, so this is one http call however long it takes to appear
+            return (root_element or self.driver).find_element(locator.by, locator.value)
+        except NoSuchElementException:
+            return None
+
     def find_element(
         self,
         locator: Locator,
         timeout: int = 10,
         condition: str = WaitCondition.PRESENCE_OF_ELEMENT_LOCATED,
-        root_element: Optional[WebElement] = None
+        root_element: Optional[WebElement] = None,
+        poll_frequency: Optional[float] = None
     ) -> Optional[WebElement]:
         if not self.driver:
             raise WebDriverException("Driver not initialized")
 
-        ec_map = {
-            WaitCondition.ELEMENT_TO_BE_CLICKABLE : EC.element_to_be_clickable,
-            WaitCondition.PRESENCE_OF_ELEMENT_LOCATED : EC.presence_of_element_located,
-            WaitCondition.PRESENCE_OF_ALL_ELEMENTS_LOCATED : EC.presence_of_all_elements_located,
-            WaitCondition.VISIBILITY_OF_ELEMENT_LOCATED : EC.visibility_of_element_located,
-            WaitCondition.VISIBILITY_OF_ALL_ELEMENTS_LOCATED : EC.visibility_of_all_elements_located,
-            WaitCondition.ELEMENT_LOCATED_SELECTION_STATE_TO_BE : EC.element_located_selection_state_to_be,
-            WaitCondition.ELEMENT_SELECTION_STATE_TO_BE : EC.element_selection_state_to_be,
-            WaitCondition.FRAME_TO_BE_AVAILABLE_AND_SWITCH_TO_IT : EC.frame_to_be_available_and_switch_to_it,
-            WaitCondition.INVISIBILITY_OF_ELEMENT : EC.invisibility_of_element,
-            WaitCondition.INVISIBILITY_OF_ELEMENT_LOCATED : EC.invisibility_of_element_located,
-            WaitCondition.PRESENCE_OF_ALL_ELEMENTS_LOCATED : EC.presence_of_all_elements_located,
-            WaitCondition.PRESENCE_OF_ELEMENT_LOCATED : EC.presence_of_element_located,
-            WaitCondition.STALENESS_OF : EC.staleness_of,
-            WaitCondition.TEXT_TO_BE_PRESENT_IN_ELEMENT : EC.text_to_be_present_in_element,
-            WaitCondition.TEXT_TO_BE_PRESENT_IN_ELEMENT_VALUE : EC.text_to_be_present_in_element_value,
-            WaitCondition.TITLE_CONTAINS : EC.title_contains,
-            WaitCondition.TITLE_IS : EC.title_is,
-            WaitCondition.URL_CONTAINS : EC.url_contains,
-            WaitCondition.URL_MATCHES : EC.url_matches,
-            WaitCondition.URL_TO_BE : EC.url_to_be,
-            WaitCondition.VISIBILITY_OF : EC.visibility_of,
-            WaitCondition.VISIBILITY_OF_ELEMENT_LOCATED : EC.visibility_of_element_located,
-            WaitCondition.VISIBILITY_OF_ALL_ELEMENTS_LOCATED : EC.visibility_of_all_elements_located,
-        }
-        ec_func = ec_map.get(condition, EC.presence_of_element_located)
+        ec_func = resolve_wait_condition(condition)
         try:
-            if root_element:
-                # search directly under root
-                return root_element.find_element(locator.by, locator.value)
-            # top-level search with wait
-            return WebDriverWait(self.driver, timeout).until(
-                ec_func((locator.by, locator.value))
-            )
+            with self._implicit_wait_suspended():
+                if root_element:
+                    # search directly under root
+                    return root_element.find_element(locator.by, locator.value)
+                # top-level search with wait
+                return self._wait(timeout, poll_frequency).until(ec_func(locator.as_tuple()))
         except TimeoutException:
             return None
 
+    def make_waiter(
+        self,
+        locator: Locator,
+        condition: str = WaitCondition.PRESENCE_OF_ELEMENT_LOCATED,
+        timeout: int = 10,
+        poll_frequency: Optional[float] = None
+    ) -> Callable[[], Optional[WebElement]]:
+        if not self.driver:
+            raise WebDriverException("Driver not initialized")
+        # condition, locator tuple and wait are resolved here once; each call of the waiter only polls
+        until = self._wait(timeout, poll_frequency).until
+        predicate = resolve_wait_condition(condition)(locator.as_tuple())
+
+        def waiter() -> Optional[WebElement]:
+            try:
+                with self._implicit_wait_suspended():
+                    return until(predicate)
+            except TimeoutException:
+                return None
+        return waiter
+
     def find_elements(
         self,
         locator: Locator,
         timeout: int = 10,
         scroll_into_view: bool = False,
-        root_element: Optional[WebElement] = None
+        root_element: Optional[WebElement] = None,
+        poll_frequency: Optional[float] = None
     ) -> List[WebElement]:
         if not self.driver:
             raise WebDriverException("Driver not initialized")
 
         try:
-            if root_element:
-                elements = root_element.find_elements(locator.by, locator.value)
-            else:
-                elements = WebDriverWait(self.driver, timeout).until(
-                    EC.presence_of_all_elements_located((locator.by, locator.value))
-                )
-            if scroll_into_view:
-                for el in elements:
-                    try:
-                        self.driver.execute_script(
-                            "arguments[0].scrollIntoView({block:'center'});", el
-                        )
-                    except WebDriverException:
-                        pass
+            with self._implicit_wait_suspended():
+                if root_element:
+                    elements = root_element.find_elements(locator.by, locator.value)
+                else:
+                    elements = self._wait(timeout, poll_frequency).until(
+                        resolve_wait_condition(WaitCondition.PRESENCE_OF_ALL_ELEMENTS_LOCATED)(locator.as_tuple())
+                    )
+            if scroll_into_view and elements:
+                try:
+                    self.driver.execute_script(SCROLL_ALL_INTO_VIEW_JS, elements)
+                except WebDriverException:
+                    pass
             return elements
         except TimeoutException:
             return []
@@ -5,7 +5,7 @@ class SeleniumWrapperException(Exception):
 
     def log_exception(self):
         """Logs the exception details."""
-        logger.error(f"Exception occurred: {self}", exc_info=True)
+        logger.error("Exception occurred: %s", self, exc_info=True)
 
 class BrowserInitializationError(SeleniumWrapperException):
     """Raised when there is an error initializing the browser."""
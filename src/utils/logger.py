@@ -30,7 +30,9 @@ class MaskingFilter(logging.Filter):
         message = record.getMessage()
         for pattern, replacement in self.patterns:
             message = re.sub(pattern, replacement, message)
+        # the message is already formatted, drop the args so handlers don't apply them a second time
         record.msg = message
+        record.args = None
         return True
 
 def setup_logger(name: str, log_file: str = "selenium_orchestrator.log", level=logging.INFO):
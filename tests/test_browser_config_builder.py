@@ -0,0 +1,45 @@
+import unittest
+
+from src.infra.browser_config_builder import BrowserConfigBuilder
+
+
+class SetArgsTest(unittest.TestCase):
+    def _snapshot(self, builder):
+        return builder.arguments, dict(builder.experimental_options), dict(builder.capabilities)
+
+    def test_applies_all_groups(self):
+        builder = BrowserConfigBuilder('chrome').set_args({
+            'argument': ['--headless'],
+            'experimental_options': {'detach': True},
+            'capabilities': {'acceptInsecureCerts': True},
+        })
+        self.assertEqual(builder.arguments, ['--headless'])
+        self.assertEqual(builder.experimental_options, {'detach': True})
+        self.assertEqual(builder.capabilities, {'acceptInsecureCerts': True})
+
+    def test_invalid_call_leaves_builder_unchanged(self):
+        invalid = [
+            {'argument': ['--headless'], 'unknown': 1},
+            {'argument': '--headless'},
+            {'argument': ['--headless', 3]},
+            {'argument': ['--headless'], 'experimental_options': ['detach']},
+            {'argument': ['--headless'], 'capabilities': None},
+        ]
+        for args in invalid:
+            with self.subTest(args=args):
+                builder = BrowserConfigBuilder('chrome').set_no_sandbox()
+                before = self._snapshot(builder)
+                with self.assertRaises(ValueError):
+                    builder.set_args(args)
+                self.assertEqual(self._snapshot(builder), before)
+
+    def test_experimental_options_rejected_for_firefox_before_arguments_apply(self):
+        builder = BrowserConfigBuilder('firefox')
+        with self.assertRaises(ValueError):
+            builder.set_args({'argument': ['-headless'], 'experimental_options': {'detach': True}})
+        self.assertEqual(builder.arguments, [])
+        self.assertEqual(builder.experimental_options, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import copy
+import pickle
+import unittest
+
+from selenium.webdriver.common.by import By
+
+from src.core.ports import Locator
+
+
+class LocatorCopyTest(unittest.TestCase):
+    def setUp(self):
+        self.locator = Locator(By.CSS_SELECTOR, '#login')
+
+    def test_copy(self):
+        self.assertEqual(copy.copy(self.locator), self.locator)
+
+    def test_deepcopy(self):
+        clone = copy.deepcopy(self.locator)
+        self.assertEqual(clone, self.locator)
+        self.assertEqual(clone.as_tuple(), (By.CSS_SELECTOR, '#login'))
+
+    def test_pickle_round_trip(self):
+        clone = pickle.loads(pickle.dumps(self.locator))
+        self.assertEqual(clone, self.locator)
+        self.assertEqual(hash(clone), hash(self.locator))
+
+    def test_deepcopy_inside_container(self):
+        fields = {self.locator: 'user'}
+        self.assertEqual(copy.deepcopy(fields), fields)
+
+    def test_still_immutable(self):
+        clone = copy.deepcopy(self.locator)
+        with self.assertRaises(AttributeError):
+            clone.value = '#other'
+
+
+class LocatorJoinTest(unittest.TestCase):
+    def test_css(self):
+        joined = Locator(By.CSS_SELECTOR, '#form').join(Locator(By.CSS_SELECTOR, 'input'))
+        self.assertEqual(joined, Locator(By.CSS_SELECTOR, '#form input'))
+
+    def test_relative_xpath(self):
+        parent = Locator(By.XPATH, '//form')
+        self.assertEqual(parent.join(Locator(By.XPATH, './input')), Locator(By.XPATH, '//form/input'))
+        self.assertEqual(parent.join(Locator(By.XPATH, './/input')), Locator(By.XPATH, '//form//input'))
+
+    def test_absolute_xpath_child_not_joined(self):
+        parent = Locator(By.XPATH, '//form')
+        self.assertIsNone(parent.join(Locator(By.XPATH, '//input')))
+        self.assertIsNone(parent.join(Locator(By.XPATH, '/html/body')))
+
+    def test_mixed_strategies_not_joined(self):
+        self.assertIsNone(Locator(By.XPATH, '//form').join(Locator(By.CSS_SELECTOR, 'input')))
+
+
+if __name__ == '__main__':
+    unittest.main()
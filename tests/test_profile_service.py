@@ -0,0 +1,224 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from selenium.common.exceptions import WebDriverException
+
+from src.application import profile_service
+from src.application.profile_service import ProfileService, _is_transient
+from src.utils.exceptions import BrowserInitializationError, DriverNotFoundError
+
+CHROME = {'browser_type': 'chrome', 'binary_path': '/usr/bin/chromedriver'}
+FIREFOX = {'browser_type': 'firefox', 'binary_path': '/usr/bin/geckodriver'}
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_calls = 0
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class FakeSession:
+    reset_delay = 0
+    reset_error = None
+
+    def __init__(self):
+        self.driver = None
+
+    def adopt(self, other):
+        self.driver, other.driver = other.driver, None
+
+    def reset(self):
+        time.sleep(self.reset_delay)
+        if self.reset_error:
+            raise self.reset_error
+
+    def close(self):
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+
+
+class FakeProfile:
+    fail_attach = False
+
+    def __init__(self, driver_name, tab_name, session, profile_options, connection, reuse_session=False):
+        if reuse_session and self.fail_attach:
+            raise ConnectionRefusedError('pooled driver is gone')
+        if not reuse_session:
+            session.driver = FakeDriver()
+        self.driver_name = driver_name
+        self.session = session
+        self.reused = reuse_session
+
+    def release(self):
+        self.session.reset()
+
+    def close(self):
+        self.session.close()
+
+
+class PoolTest(unittest.TestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(profile_service, 'Profile', FakeProfile),
+            mock.patch.object(profile_service, 'SeleniumSession', FakeSession),
+            mock.patch.object(FakeSession, 'reset_delay', 0),
+            mock.patch.object(FakeSession, 'reset_error', None),
+            mock.patch.object(FakeProfile, 'fail_attach', False),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def _key(self, service):
+        (key,) = service._idle
+        return key
+
+    def test_checkout_by_key(self):
+        service = ProfileService(max_idle_sessions=2)
+        first = FakeSession()
+        service.new_profile('a', 'main', first, None, CHROME)
+        driver = first.driver
+        service.remove_profile('a')
+        # parked: the caller's session no longer owns the driver
+        self.assertIsNone(first.driver)
+        self.assertEqual(driver.quit_calls, 0)
+
+        other = FakeSession()
+        profile = service.new_profile('b', 'main', other, None, FIREFOX)
+        self.assertFalse(profile.reused)
+        self.assertIsNot(other.driver, driver)
+
+        same = FakeSession()
+        profile = service.new_profile('c', 'main', same, None, CHROME)
+        self.assertTrue(profile.reused)
+        self.assertIs(profile.session, same)
+        self.assertIs(same.driver, driver)
+        self.assertEqual(service._idle[self._key(service)], [])
+
+    def test_cap_under_concurrent_removals(self):
+        FakeSession.reset_delay = 0.05
+        service = ProfileService(max_idle_sessions=1)
+        sessions = [FakeSession() for _ in range(4)]
+        for index, session in enumerate(sessions):
+            service.new_profile(f'p{index}', 'main', session, None, CHROME)
+        drivers = [session.driver for session in sessions]
+
+        threads = [threading.Thread(target=service.remove_profile, args=(f'p{index}',)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        key = self._key(service)
+        self.assertEqual(len(service._idle[key]), 1)
+        self.assertEqual(sum(driver.quit_calls for driver in drivers), 3)
+        self.assertEqual(service._parking[key], 0)
+
+    def test_attach_failure_quits_pooled_driver(self):
+        service = ProfileService(max_idle_sessions=1)
+        first = FakeSession()
+        service.new_profile('a', 'main', first, None, CHROME)
+        driver = first.driver
+        service.remove_profile('a')
+
+        FakeProfile.fail_attach = True
+        second = FakeSession()
+        with self.assertRaises(ConnectionRefusedError):
+            service.new_profile('b', 'main', second, None, CHROME)
+        self.assertEqual(driver.quit_calls, 1)
+        self.assertIsNone(second.driver)
+        self.assertIsNone(service.get_profile('b'))
+        self.assertEqual(service._idle[self._key(service)], [])
+
+    def test_failing_reset_closes_profile(self):
+        FakeSession.reset_error = ConnectionRefusedError('driver process died')
+        service = ProfileService(max_idle_sessions=1)
+        session = FakeSession()
+        service.new_profile('a', 'main', session, None, CHROME)
+        driver = session.driver
+
+        service.remove_profile('a')
+
+        self.assertEqual(driver.quit_calls, 1)
+        self.assertIsNone(service.get_profile('a'))
+        self.assertEqual(service._idle, {})
+        self.assertEqual(sum(service._parking.values()), 0)
+
+    def test_pooling_disabled_closes(self):
+        service = ProfileService()
+        session = FakeSession()
+        service.new_profile('a', 'main', session, None, CHROME)
+        driver = session.driver
+        service.remove_profile('a')
+        self.assertEqual(driver.quit_calls, 1)
+
+
+def wrapping(cause):
+    # what DriverCreator raises: the original failure ends up as the context of a BrowserInitializationError
+    error = BrowserInitializationError('chrome', f'Unexpected error: {cause}')
+    error.__context__ = cause
+    return error
+
+
+class RetryTest(unittest.TestCase):
+    def setUp(self):
+        self.service = ProfileService()
+        self.session = mock.Mock()
+        self.sleep = mock.patch.object(profile_service.time, 'sleep').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def _run(self, failures, **kwargs):
+        with mock.patch.object(self.service, 'new_profile', side_effect=failures) as new_profile:
+            try:
+                return self.service.new_profile_resilient('a', 'main', self.session, None, {}, **kwargs)
+            finally:
+                self.calls = new_profile.call_count
+
+    def test_transient_classification(self):
+        self.assertTrue(_is_transient(WebDriverException('grid busy')))
+        self.assertTrue(_is_transient(wrapping(WebDriverException('grid busy'))))
+        self.assertTrue(_is_transient(wrapping(ConnectionRefusedError())))
+        self.assertFalse(_is_transient(wrapping(DriverNotFoundError('ChromeDriver'))))
+        self.assertFalse(_is_transient(BrowserInitializationError('opera')))
+
+    def test_retries_transient_failures(self):
+        profile = object()
+        result = self._run([wrapping(WebDriverException('grid busy')), WebDriverException('grid busy'), profile])
+        self.assertIs(result, profile)
+        self.assertEqual(self.calls, 3)
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [0.5, 1.0])
+        self.assertEqual(self.session.close.call_count, 2)
+
+    def test_backoff_repeats_last_delay(self):
+        failures = [WebDriverException('grid busy')] * 5
+        with self.assertRaises(WebDriverException):
+            self._run(failures, attempts=5, backoff=(1, 2))
+        self.assertEqual(self.calls, 5)
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [1, 2, 2, 2])
+        self.assertEqual(self.session.close.call_count, 5)
+
+    def test_empty_backoff_uses_default(self):
+        with self.assertRaises(WebDriverException):
+            self._run([WebDriverException('grid busy')] * 2, attempts=2, backoff=())
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [0.5])
+
+    def test_permanent_failure_not_retried(self):
+        with self.assertRaises(BrowserInitializationError):
+            self._run([wrapping(DriverNotFoundError('ChromeDriver'))])
+        self.assertEqual(self.calls, 1)
+        self.sleep.assert_not_called()
+        self.session.close.assert_called_once()
+
+    def test_attempts_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            self._run([], attempts=0)
+        self.assertEqual(self.calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()